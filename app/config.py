@@ -12,11 +12,87 @@ class Settings(BaseSettings):
     max_tokens: int = 1500
     temperature: float = 0.3
     
+    # LLM gateway settings (tuned to the Groq free-tier quota)
+    groq_base_url: Optional[str] = None
+    llm_timeout_seconds: float = 30.0
+    llm_max_concurrency: int = 4
+    llm_requests_per_minute: int = 30
+    llm_burst_size: int = 5
+    llm_max_retries: int = 3
+    llm_backoff_base_seconds: float = 0.5
+    llm_backoff_max_seconds: float = 10.0
+    llm_circuit_failure_threshold: int = 5
+    llm_circuit_reset_seconds: float = 30.0
+    
+    # Prompt token budgets (resume/JD text packed by relevance)
+    career_advice_token_budget: int = 900
+    job_match_token_budget: int = 800
+    
+    # Resume section retrieval for career advice
+    resume_chunk_chars: int = 600
+    career_advice_top_k: int = 4
+    
+    # Partial skill matching (skill graph + embedding similarity)
+    skill_similarity_threshold: float = 0.75
+    skill_partial_credit_max: float = 0.8
+    
+    # Job description registry
+    jd_cache_size: int = 500
+    jd_preview_chars: int = 300
+    
+    # Write-behind buffer for match/chat history rows
+    history_batch_rows: int = 100
+    history_flush_ms: int = 200
+    
+    # Background upload pipeline
+    job_queue_path: str = "data/jobs.db"
+    parse_workers: int = 2
+    embed_workers: int = 1
+    upload_queue_max: int = 100
+    parse_max_attempts: int = 3
+    job_poll_interval: float = 0.5
+    
+    # Upload limits (streamed in chunks; bytes kept in memory for the parse worker)
+    max_upload_bytes: int = 10 * 1024 * 1024
+    upload_chunk_bytes: int = 256 * 1024
+    upload_buffer_max_bytes: int = 64 * 1024 * 1024
+    
+    # Signed resume view links (served without a DB lookup)
+    view_url_ttl_seconds: int = 300
+    
+    # Authenticated user lookups (cached per process; stateless reads claims from the token)
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_entries: int = 10000
+    stateless_auth: bool = False
+    
+    # Bulk import (python -m app.ingest)
+    ingest_batch_size: int = 64
+    
+    # Database (SQLite file by default; postgresql://... uses a pooled engine)
+    database_url: str = "sqlite:///./career_compass.db"
+    sqlite_busy_timeout_ms: int = 5000
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    
     # Vector store settings
     vector_dimension: int = 384
     upload_dir: str = "uploads"
     vector_store_path: str = "data/vector_store"
     
+    # LLM response cache settings
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "data/llm_cache.db"
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_entries: int = 5000
+    
+    # Semantic cache for career advice questions
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_max_per_resume: int = 50
+    semantic_cache_max_resumes: int = 1000
+    
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -0,0 +1,102 @@
+# Database engine and session factory, shared by the API and command-line tools.
+import os
+import sys
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Top-level models module lives one directory up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Base
+import app.db_models  # noqa: F401 - registers the app-owned tables on Base
+from app.migrations import ensure_indexes
+from app.config import get_settings
+
+
+# Async drivers used for each backend when the configured URL names a sync one
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def set_sqlite_pragmas(dbapi_connection, _):
+    # WAL lets readers run alongside the single writer; NORMAL sync is
+    # durable against app crashes and only fsyncs at checkpoints
+    busy_timeout_ms = int(get_settings().sqlite_busy_timeout_ms)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def pool_options(url: str) -> dict:
+    """Engine arguments per backend: SQLite connect args, or a pre-pinged pool for servers"""
+    settings = get_settings()
+    if url.startswith("sqlite"):
+        return {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": settings.sqlite_busy_timeout_ms / 1000
+            }
+        }
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": True
+    }
+
+
+def create_database_engine(url: str) -> Engine:
+    """Engine tuned for the backend"""
+    engine = create_engine(url, **pool_options(url))
+    if url.startswith("sqlite"):
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+def async_database_url(url: str) -> str:
+    """Same database through its async driver, e.g. sqlite:// -> sqlite+aiosqlite://"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.get_driver_name() in ("aiosqlite", "asyncpg") or backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def create_async_database_engine(url: str) -> AsyncEngine:
+    """Async counterpart of create_database_engine, used by the request-path queries"""
+    async_url = async_database_url(url)
+    engine = create_async_engine(async_url, **pool_options(async_url))
+    if async_url.startswith("sqlite"):
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+DATABASE_URL = get_settings().database_url
+engine = create_database_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_database_engine(DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+# Create all tables, then indexes added to tables that already existed
+Base.metadata.create_all(bind=engine)
+ensure_indexes(engine)
+
+
+# Dependency to get DB session
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dependency to get an async DB session (queries don't block the event loop)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,39 @@
+# Additional tables owned by the app package. They share the declarative Base
+# from the top-level models module, so create_all() in main creates them too.
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, JSON, LargeBinary, ForeignKey
+from models import Base
+
+
+class JobDescription(Base):
+    """Registry of parsed job descriptions, deduplicated by normalized-text hash"""
+    __tablename__ = "job_descriptions"
+
+    jd_hash = Column(String(64), primary_key=True)
+    job_title = Column(String(100))
+    text = Column(Text, nullable=False)
+    skills = Column(JSON, nullable=False)
+    required_years = Column(Integer, nullable=False, default=0)
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class JobMatchDescription(Base):
+    """Links a JobMatchHistory row to its registered job description"""
+    __tablename__ = "job_match_descriptions"
+
+    match_id = Column(Integer, ForeignKey("job_match_history.id", ondelete="CASCADE"), primary_key=True)
+    jd_hash = Column(String(64), ForeignKey("job_descriptions.jd_hash"), nullable=False, index=True)
+
+
+class ResumeFile(Base):
+    """Where a resume's uploaded file is stored; identical files share one blob"""
+    __tablename__ = "resume_files"
+
+    resume_id = Column(String(36), primary_key=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    extension = Column(String(10), nullable=False)
+    media_type = Column(String(100), nullable=False)
+    size = Column(Integer, nullable=False)
+    path = Column(String(255), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,387 @@
+# Bulk resume import: python -m app.ingest <directory|archive> --email owner@example.com
+#
+# Parses files across a process pool, embeds whole batches at once and writes
+# vectors and DB rows per batch. Progress is checkpointed so an interrupted
+# import can be re-run and picks up where it stopped.
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import uuid
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import User, UserResume
+from app.config import get_settings
+from app.database import SessionLocal
+from app.services.blob_store import BlobStore
+from app.services.embeddings import EmbeddingService
+from app.services.parsed_resume import ParsedResume
+from app.services.upload_pipeline import parse_resume_file
+from app.services.vector_store import VectorStore
+
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+# Fixed namespace so the same file imported for the same user always gets the same resume_id
+INGEST_NAMESPACE = uuid.UUID("6f1f7c52-2f4e-4d8e-9a52-3c1f3f0b8f5e")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def collect_files(source: str, workdir: str) -> List[Tuple[str, str]]:
+    """(name, path) of every PDF/DOCX in a directory, .zip or .tar(.gz) archive"""
+    if os.path.isdir(source):
+        files = []
+        for root, _, names in os.walk(source):
+            for name in sorted(names):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    files.append((os.path.relpath(path, source), path))
+        return sorted(files)
+
+    files = []
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for position, info in enumerate(archive.infolist()):
+                if info.is_dir() or not info.filename.lower().endswith(RESUME_EXTENSIONS):
+                    continue
+                # Flattened names - never trust paths stored in the archive
+                path = os.path.join(workdir, f"{position}_{os.path.basename(info.filename)}")
+                with archive.open(info) as src, open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                files.append((info.filename, path))
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for position, member in enumerate(archive.getmembers()):
+                if not member.isfile() or not member.name.lower().endswith(RESUME_EXTENSIONS):
+                    continue
+                path = os.path.join(workdir, f"{position}_{os.path.basename(member.name)}")
+                with archive.extractfile(member) as src, open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                files.append((member.name, path))
+    else:
+        raise ValueError(f"{source} is not a directory, zip or tar archive")
+    return files
+
+
+class IngestCheckpoint:
+    """Append-only JSON lines log of finished files, keyed by content hash"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["sha256"]] = entry
+
+    def status(self, sha256: str) -> Optional[str]:
+        entry = self.entries.get(sha256)
+        return entry["status"] if entry else None
+
+    def record(self, entries: List[dict]):
+        """Durably append a batch of results"""
+        if not entries:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+                self.entries[entry["sha256"]] = entry
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class BulkIngestor:
+    """Imports many resume files for one user with batched embedding and writes"""
+
+    def __init__(self, user_id: str, checkpoint: IngestCheckpoint, workers: int, batch_size: int, save_every: int):
+        self.settings = get_settings()
+        self.user_id = user_id
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.batch_size = batch_size
+        self.save_every = save_every
+
+        self.blob_store = BlobStore()
+        self.embedding_service = EmbeddingService()
+        self.vector_store = VectorStore()
+        self.vector_store.load()
+
+        # Results are only checkpointed once the vector store holding them is on disk
+        self._unsaved: List[dict] = []
+        self.stats = {"imported": 0, "failed": 0, "skipped": 0, "parse_wait": 0.0, "embed": 0.0, "write": 0.0}
+
+    def plan(self, files: List[Tuple[str, str]], retry_failed: bool) -> List[dict]:
+        """Hash every file and drop ones already imported (or duplicated within the run)"""
+        pending = []
+        seen = set()
+        for name, path in files:
+            sha256 = file_sha256(path)
+            status = self.checkpoint.status(sha256)
+            if sha256 in seen or status == "done" or (status == "failed" and not retry_failed):
+                self.stats["skipped"] += 1
+                continue
+            seen.add(sha256)
+            pending.append({
+                "name": name,
+                "path": path,
+                "sha256": sha256,
+                "resume_id": str(uuid.uuid5(INGEST_NAMESPACE, f"{self.user_id}:{sha256}")),
+                "ext": os.path.splitext(path)[1].lower().lstrip(".")
+            })
+        return pending
+
+    def run(self, pending: List[dict]):
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        started = time.perf_counter()
+        done = 0
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            # Parse the next batch in the pool while the current one is embedded and written
+            upcoming = self._submit(pool, batches[0]) if batches else []
+            for number, batch in enumerate(batches, start=1):
+                futures = upcoming
+                if number < len(batches):
+                    upcoming = self._submit(pool, batches[number])
+
+                self._write_batch(self._collect(batch, futures))
+                if number % self.save_every == 0:
+                    self._save()
+
+                done += len(batch)
+                elapsed = time.perf_counter() - started
+                rate = done / elapsed if elapsed else 0.0
+                remaining = (len(pending) - done) / rate if rate else 0.0
+                print(
+                    f"📦 [{done}/{len(pending)}] {self.stats['imported']} imported, "
+                    f"{self.stats['failed']} failed | {rate:.1f} files/s | ETA {remaining:.0f}s"
+                )
+
+        self._save()
+        return time.perf_counter() - started
+
+    def _submit(self, pool: ProcessPoolExecutor, batch: List[dict]) -> List[Future]:
+        futures = []
+        for item in batch:
+            # Files go into the blob store (shared with identical uploads) before parsing
+            item["file_path"] = self.blob_store.path_for(item["sha256"], item["ext"])
+            item["new_blob"] = not os.path.exists(item["file_path"])
+            if item["new_blob"]:
+                os.makedirs(os.path.dirname(item["file_path"]), exist_ok=True)
+                shutil.copyfile(item["path"], item["file_path"])
+            futures.append(pool.submit(parse_resume_file, item["resume_id"], item["file_path"]))
+        return futures
+
+    def _collect(self, batch: List[dict], futures: List[Future]) -> List[Tuple[dict, ParsedResume]]:
+        waited = time.perf_counter()
+        parsed = []
+        failures = []
+        for item, future in zip(batch, futures):
+            try:
+                parsed.append((item, future.result()))
+            except Exception as e:
+                print(f"❌ {item['name']}: {e}")
+                if item["new_blob"]:
+                    os.remove(item["file_path"])
+                failures.append(self._entry(item, "failed", error=str(e)[:500]))
+        self.stats["parse_wait"] += time.perf_counter() - waited
+        self.stats["failed"] += len(failures)
+        self._unsaved.extend(failures)
+        return parsed
+
+    def _write_batch(self, parsed: List[Tuple[dict, ParsedResume]]):
+        if not parsed:
+            return
+
+        # Re-runs after a crash may find part of a batch already stored
+        finished = parsed
+        parsed = [
+            (item, resume) for item, resume in parsed
+            if not self.vector_store.has_documents(resume.resume_id, "resume")
+        ]
+        self.stats["skipped"] += len(finished) - len(parsed)
+
+        started = time.perf_counter()
+        if parsed:
+            documents = [resume.text[:5000] for _, resume in parsed]
+            doc_embeddings = self.embedding_service.generate_embeddings_batch(documents)
+            sections = [
+                (resume.resume_id, chunk) for _, resume in parsed for chunk in resume.sections
+            ]
+            section_embeddings = (
+                self.embedding_service.generate_embeddings_batch([chunk["text"] for _, chunk in sections])
+                if sections else None
+            )
+        self.stats["embed"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        if parsed:
+            self.vector_store.add_documents(
+                embeddings=np.asarray(doc_embeddings, dtype='float32'),
+                documents=documents,
+                metadata=[
+                    {"resume_id": resume.resume_id, "user_id": self.user_id, "type": "resume"}
+                    for _, resume in parsed
+                ]
+            )
+            if sections:
+                # Same layout as RAGService.index_resume_sections
+                self.vector_store.add_documents(
+                    embeddings=np.asarray(section_embeddings, dtype='float32'),
+                    documents=[chunk["text"] for _, chunk in sections],
+                    metadata=[
+                        {"resume_id": resume_id, "user_id": self.user_id,
+                         "type": "resume_section", "section": chunk["section"]}
+                        for resume_id, chunk in sections
+                    ]
+                )
+
+            for (_, resume), embedding in zip(parsed, doc_embeddings):
+                resume.embedding = embedding.tolist()
+                resume.save()
+
+            self._insert_rows(parsed)
+
+        self.stats["imported"] += len(parsed)
+        self._unsaved.extend(
+            self._entry(item, "done", resume_id=resume.resume_id) for item, resume in finished
+        )
+        self.stats["write"] += time.perf_counter() - started
+
+    def _insert_rows(self, parsed: List[Tuple[dict, ParsedResume]]):
+        """One transaction per batch; rows left by an interrupted run are not duplicated"""
+        db = SessionLocal()
+        try:
+            resume_ids = [resume.resume_id for _, resume in parsed]
+            existing = {
+                row.resume_id for row in
+                db.query(UserResume.resume_id).filter(UserResume.resume_id.in_(resume_ids))
+            }
+            db.add_all([
+                UserResume(
+                    user_id=self.user_id,
+                    resume_id=resume.resume_id,
+                    filename=os.path.basename(item["name"]),
+                    skills_count=len(resume.skills),
+                    extracted_text=resume.text[:1000]
+                )
+                for item, resume in parsed
+                if resume.resume_id not in existing
+            ])
+            for item, resume in parsed:
+                if resume.resume_id not in existing:
+                    self.blob_store.attach(
+                        db, resume.resume_id, item["sha256"], item["ext"],
+                        os.path.getsize(item["file_path"]), item["file_path"]
+                    )
+            db.commit()
+            # A reused blob may have been released by the API before these references landed
+            for item, _ in parsed:
+                if not os.path.exists(item["file_path"]):
+                    os.makedirs(os.path.dirname(item["file_path"]), exist_ok=True)
+                    shutil.copyfile(item["path"], item["file_path"])
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _save(self):
+        started = time.perf_counter()
+        self.vector_store.save()
+        self.checkpoint.record(self._unsaved)
+        self._unsaved = []
+        self.stats["write"] += time.perf_counter() - started
+
+    @staticmethod
+    def _entry(item: dict, status: str, resume_id: str = None, error: str = None) -> dict:
+        return {
+            "sha256": item["sha256"],
+            "name": item["name"],
+            "status": status,
+            "resume_id": resume_id,
+            "error": error
+        }
+
+
+def resolve_user(email: str = None, user_id: str = None) -> User:
+    db = SessionLocal()
+    try:
+        query = db.query(User)
+        user = query.filter(User.id == user_id).first() if user_id else query.filter(User.email == email).first()
+        if user is None:
+            raise SystemExit(f"❌ No user found for {user_id or email}")
+        return user
+    finally:
+        db.close()
+
+
+def main(argv: List[str] = None):
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="python -m app.ingest",
+        description="Import a directory or archive of PDF/DOCX resumes for one user. "
+                    "Stop the API first: it keeps its own copy of the vector store in memory."
+    )
+    parser.add_argument("source", help="Directory, .zip or .tar(.gz) archive of resumes")
+    owner = parser.add_mutually_exclusive_group(required=True)
+    owner.add_argument("--email", help="Email of the user who will own the resumes")
+    owner.add_argument("--user-id", help="ID of the user who will own the resumes")
+    parser.add_argument("--workers", type=int, default=settings.parse_workers, help="Parse processes")
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size, help="Files embedded and written together")
+    parser.add_argument("--save-every", type=int, default=10, help="Batches between vector store saves / checkpoints")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <source>.ingest.jsonl)")
+    parser.add_argument("--retry-failed", action="store_true", help="Retry files that failed in an earlier run")
+    args = parser.parse_args(argv)
+
+    source = os.path.abspath(args.source.rstrip("/"))
+    user = resolve_user(email=args.email, user_id=args.user_id)
+    checkpoint = IngestCheckpoint(args.checkpoint or f"{source}.ingest.jsonl")
+    os.makedirs(settings.upload_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="ingest-") as workdir:
+        files = collect_files(source, workdir)
+        print(f"📂 Found {len(files)} resume files in {source}")
+
+        ingestor = BulkIngestor(
+            user_id=user.id,
+            checkpoint=checkpoint,
+            workers=max(1, args.workers),
+            batch_size=max(1, args.batch_size),
+            save_every=max(1, args.save_every)
+        )
+        pending = ingestor.plan(files, retry_failed=args.retry_failed)
+        print(f"🚀 Importing {len(pending)} files for {user.email} ({ingestor.stats['skipped']} already done or duplicate)")
+        elapsed = ingestor.run(pending)
+
+    stats = ingestor.stats
+    rate = stats["imported"] / elapsed if elapsed else 0.0
+    print(f"✅ Imported {stats['imported']}, failed {stats['failed']}, skipped {stats['skipped']} in {elapsed:.1f}s ({rate:.1f} resumes/s)")
+    print(f"   parse wait {stats['parse_wait']:.1f}s | embed {stats['embed']:.1f}s | write {stats['write']:.1f}s")
+    print(f"   checkpoint: {checkpoint.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,20 @@
 # ==================== IMPORTS ====================
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, status
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import JSONResponse, FileResponse
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from fastapi.responses import JSONResponse, FileResponse, Response
+from sqlalchemy import and_, delete, exists, func, literal, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, List, Dict, Tuple
 from jose import JWTError, jwt
+import asyncio
 import os
 import uuid
-import shutil
+import time
 import numpy as np
 import sys
 
@@ -20,6 +23,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import authentication and database models
 from models import Base, User, UserResume, JobMatchHistory, ChatHistory  
+from app.db_models import JobDescription, JobMatchDescription, ResumeFile
+from app.database import SessionLocal, get_db, get_async_db
 from auth import (
     get_password_hash,
     authenticate_user,
@@ -44,6 +49,19 @@ from app.services.skill_extractor import SkillExtractor
 from app.services.embeddings import EmbeddingService
 from app.services.vector_store import VectorStore
 from app.services.rag_service import RAGService
+from app.services.parsed_resume import ParsedResume, build_parsed_resume
+from app.services.jd_registry import JDRegistry
+from app.services.job_queue import JobQueue, STAGE_PARSE, STAGE_DONE
+from app.services.upload_pipeline import UploadPipeline
+from app.services.blob_store import BlobStore
+from app.services.signed_urls import ViewUrlSigner
+from app.services.user_cache import UserCache, AuthenticatedUser
+from app.services.history_writer import HistoryWriter
+from app.services.account_deletion import AccountDeletion
+from app.services.pagination import keyset_page, select_fields
+from app.services.upload_stream import (
+    stream_upload, size_limit_message, UploadTooLargeError, UploadTypeError, MEDIA_TYPES
+)
 from app.config import get_settings
 
 # ==================== FASTAPI APP ====================
@@ -63,50 +81,111 @@ app.add_middleware(
 )
 
 # ==================== DATABASE SETUP ====================
-DATABASE_URL = "sqlite:///./career_compass.db"
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create all tables
-Base.metadata.create_all(bind=engine)
-
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
+# Engine, sessions and table creation live in app.database
 print("✅ Database initialized successfully!")
 
 # ==================== AUTH HELPER ====================
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Get current authenticated user from token"""
-    from models import User
-    
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def token_claims(token: str) -> dict:
+    """Verified claims from a bearer token, or 401"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
+        if payload.get("sub") is None:
+            raise credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
-    
-    return user
+    return payload
+
+
+def issue_access_token(user) -> str:
+    """Access token for a user; stateless mode carries the profile claims too"""
+    claims = AuthenticatedUser.from_user(user).claims() if settings.stateless_auth else {"sub": user.id}
+    return create_access_token(
+        data=claims, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+
+class RequestContext:
+    """Authenticated user and the resumes they touch, loaded once per request"""
+    
+    def __init__(self, claims: dict, db: AsyncSession):
+        self.claims = claims
+        self.user_id: str = claims["sub"]
+        self.db = db
+        self._user: Optional[AuthenticatedUser] = None
+        self._resumes: Dict[str, Optional[UserResume]] = {}
+    
+    def _known_user(self) -> Optional[AuthenticatedUser]:
+        """User from token claims or the user cache, without touching the database"""
+        if settings.stateless_auth:
+            user = AuthenticatedUser.from_claims(self.claims)
+            if user is not None:
+                if user_cache.is_revoked(user.id):
+                    raise credentials_exception()
+                return user
+        return user_cache.get(self.user_id)
+    
+    def _remember(self, user: User) -> AuthenticatedUser:
+        self._user = AuthenticatedUser.from_user(user)
+        user_cache.put(self._user)
+        return self._user
+    
+    async def user(self) -> AuthenticatedUser:
+        if self._user is None:
+            self._user = self._known_user()
+        if self._user is None:
+            user = await self.db.get(User, self.user_id)
+            if user is None:
+                raise credentials_exception()
+            self._remember(user)
+        return self._user
+    
+    async def user_and_resume(self, resume_id: str) -> Tuple[AuthenticatedUser, Optional[UserResume]]:
+        """User plus their resume row (None if not theirs), at most one query"""
+        if resume_id not in self._resumes:
+            if self._user is None:
+                self._user = self._known_user()
+            if self._user is not None:
+                self._resumes[resume_id] = await self.db.scalar(select(UserResume).where(
+                    UserResume.resume_id == resume_id, UserResume.user_id == self.user_id
+                ))
+            else:
+                result = await self.db.execute(select(User, UserResume).outerjoin(
+                    UserResume,
+                    and_(UserResume.user_id == User.id, UserResume.resume_id == resume_id)
+                ).where(User.id == self.user_id))
+                row = result.first()
+                if row is None:
+                    raise credentials_exception()
+                self._remember(row[0])
+                self._resumes[resume_id] = row[1]
+        return self._user, self._resumes[resume_id]
+
+
+async def get_request_context(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> RequestContext:
+    """Request-scoped resolver, shared by every dependency in the same request"""
+    context = getattr(request.state, "context", None)
+    if context is None:
+        context = RequestContext(token_claims(token), db)
+        request.state.context = context
+    return context
+
+
+async def get_current_user(context: RequestContext = Depends(get_request_context)) -> AuthenticatedUser:
+    """Get current authenticated user from token (cached, or from claims in stateless mode)"""
+    return await context.user()
 
 # ==================== PYDANTIC MODELS FOR AUTH ====================
 class UserCreate(BaseModel):
@@ -139,14 +218,190 @@ parser = ResumeParser()
 skill_extractor = SkillExtractor()
 embedding_service = EmbeddingService()
 vector_store = VectorStore()
-rag_service = RAGService()
+vector_store.load()
+rag_service = RAGService(embedding_service=embedding_service, vector_store=vector_store)
+jd_registry = JDRegistry(skill_extractor, embedding_service)
+blob_store = BlobStore()
+view_signer = ViewUrlSigner(SECRET_KEY)
+user_cache = UserCache()
+history_writer = HistoryWriter(SessionLocal)
 
 # In-memory storage for resume data
 resume_storage: Dict[str, dict] = {}
 
+
+def publish_processed_resume(job: dict, parsed: ParsedResume):
+    """Called by the upload pipeline when a resume finishes processing"""
+    db = SessionLocal()
+    try:
+        db.query(UserResume).filter(UserResume.resume_id == job["resume_id"]).update({
+            UserResume.skills_count: len(parsed.skills),
+            UserResume.extracted_text: parsed.text[:1000]
+        })
+        db.commit()
+    finally:
+        db.close()
+    
+    resume_storage[job["resume_id"]] = {
+        "parsed": parsed,
+        "file_path": job["file_path"],
+        "user_id": job["user_id"]
+    }
+
+
+# Background upload processing (persistent queue + parse/embed worker pools)
+upload_queue = JobQueue()
+upload_pipeline = UploadPipeline(
+    queue=upload_queue,
+    embedding_service=embedding_service,
+    vector_store=vector_store,
+    index_sections=rag_service.index_resume_sections,
+    on_ready=publish_processed_resume
+)
+
+# Cascading account deletion (bulk SQL, vector tombstones, background file cleanup)
+account_deletion = AccountDeletion(
+    session_factory=SessionLocal,
+    blob_store=blob_store,
+    vector_store=vector_store,
+    upload_queue=upload_queue,
+    upload_pipeline=upload_pipeline,
+    history_writer=history_writer,
+    semantic_cache=rag_service.semantic_cache,
+    resume_storage=resume_storage
+)
+
+
+# Refuse oversized uploads from Content-Length before the multipart body is read
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if request.url.path == "/upload-resume":
+        content_length = request.headers.get("content-length")
+        if content_length:
+            # A malformed header is the client's error, not a 500
+            try:
+                declared = int(content_length)
+            except ValueError:
+                declared = -1
+            if declared < 0:
+                return JSONResponse(status_code=400, content={"detail": "Invalid Content-Length header"})
+            # Small allowance for multipart boundaries and headers
+            if declared > settings.max_upload_bytes + 64 * 1024:
+                return JSONResponse(
+                    status_code=413,
+                    content={"detail": size_limit_message(settings.max_upload_bytes)}
+                )
+    return await call_next(request)
+
+
+@app.on_event("startup")
+def start_upload_pipeline():
+    upload_pipeline.start()
+
+
+@app.on_event("shutdown")
+def stop_upload_pipeline():
+    upload_pipeline.stop()
+
+
+@app.on_event("startup")
+def start_history_writer():
+    history_writer.start()
+
+
+@app.on_event("shutdown")
+def stop_history_writer():
+    # Writes whatever is still buffered
+    history_writer.stop()
+
+
+@app.on_event("shutdown")
+def stop_account_cleanup():
+    account_deletion.shutdown()
+
+
+async def flush_pending_history(user_id: str):
+    """Write the user's buffered history rows before reading history back"""
+    if history_writer.pending(user_id):
+        await asyncio.to_thread(history_writer.flush)
+
 # ==================== HELPER FUNCTION FOR RESUME LOADING ====================
-def get_resume_data(resume_id: str, user_id: str, db: Session) -> dict:
-    """Get resume data from memory or reload from database"""
+def owns_resume(resume_id: str, user_id: str, db: Session) -> bool:
+    """Ownership check answered from the (resume_id, user_id) index without reading the row"""
+    return db.query(
+        exists().where(UserResume.resume_id == resume_id, UserResume.user_id == user_id)
+    ).scalar()
+
+
+def find_resume_file(resume_id: str, db: Session) -> Tuple[Optional[str], Optional[str]]:
+    """(path, media_type) of a resume's stored file, or (None, None)"""
+    record = blob_store.locate(db, resume_id)
+    if record:
+        return record.path, record.media_type
+    
+    # Uploaded before the blob store - stored flat as uploads/{resume_id}.{ext}
+    for ext in MEDIA_TYPES:
+        potential_path = f"{settings.upload_dir}/{resume_id}.{ext}"
+        if os.path.exists(potential_path):
+            return potential_path, MEDIA_TYPES[ext]
+    return None, None
+
+
+def ensure_resume_blob(resume_id: str, db: Session) -> Optional[ResumeFile]:
+    """Blob record for a resume, moving a pre-blob-store file into the store on first use"""
+    record = blob_store.locate(db, resume_id)
+    if record:
+        return record
+    file_path, _ = find_resume_file(resume_id, db)
+    return blob_store.adopt(db, resume_id, file_path) if file_path else None
+
+
+def conditional_file_response(
+    request: Request, path: str, media_type: str, filename: str, sha256: str, cache_control: str
+) -> Response:
+    """
+    Serve a file with a content-hash ETag and Last-Modified. Matching
+    If-None-Match / If-Modified-Since get a bodyless 304; Range requests are
+    handled by FileResponse.
+    """
+    stat_result = os.stat(path)
+    headers = {
+        "ETag": f'"{sha256}"',
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    not_modified = False
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        not_modified = "*" in tags or headers["ETag"] in tags
+    elif if_modified_since:
+        try:
+            not_modified = int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            pass
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    
+    headers["Content-Disposition"] = f"inline; filename={filename}"
+    return FileResponse(path=path, media_type=media_type, headers=headers, stat_result=stat_result)
+
+
+def remove_resume_file(resume_id: str, db: Session):
+    """Delete a resume's file; a shared blob stays while other resumes still use it"""
+    if blob_store.locate(db, resume_id):
+        blob_store.release(db, resume_id)
+        return
+    file_path, _ = find_resume_file(resume_id, db)
+    if file_path:
+        os.remove(file_path)
+        print(f"   ✓ Deleted file: {file_path}")
+
+
+def get_resume_data(resume_id: str, user_id: str, db: Session, owned: bool = False) -> dict:
+    """Get resume data from memory or reload from database; owned=True skips the ownership query"""
     
     # Check if in memory
     if resume_id in resume_storage and resume_storage[resume_id]["user_id"] == user_id:
@@ -155,46 +410,42 @@ def get_resume_data(resume_id: str, user_id: str, db: Session) -> dict:
     # Not in memory - reload from database
     print(f"📂 Resume {resume_id} not in memory, reloading from database...")
     
-    user_resume = db.query(UserResume).filter(
-        UserResume.resume_id == resume_id,
-        UserResume.user_id == user_id
-    ).first()
-    
-    if not user_resume:
+    if not owned and not owns_resume(resume_id, user_id, db):
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Check if file still exists
-    file_extensions = ['pdf', 'docx']
-    file_path = None
+    # Uploads still in the background pipeline can't be analyzed yet
+    job = upload_queue.get(resume_id)
+    if job and job["status"] != "done":
+        if job["status"] == "failed":
+            raise HTTPException(status_code=422, detail=f"Resume processing failed: {job['error']}")
+        raise HTTPException(status_code=409, detail="Resume is still processing. Please try again shortly.")
     
-    for ext in file_extensions:
-        potential_path = f"{settings.upload_dir}/{resume_id}.{ext}"
-        if os.path.exists(potential_path):
-            file_path = potential_path
-            break
+    # Prefer the parsed form serialized at upload - no re-parsing needed
+    parsed = ParsedResume.load(resume_id)
+    
+    # Check if file still exists
+    file_path, _ = find_resume_file(resume_id, db)
     
-    if not file_path:
+    if not file_path and parsed is None:
         raise HTTPException(
             status_code=404, 
             detail="Resume file not found. Please upload the resume again."
         )
     
-    # Extract text again
     try:
-        if file_path.endswith('.pdf'):
-            text = parser.extract_text_from_pdf(file_path)
-        else:
-            text = parser.extract_text_from_docx(file_path)
-        
-        # Extract skills again
-        skills = skill_extractor.extract_skills(text)
-        domains = skill_extractor.identify_domains(skills)
+        if parsed is None:
+            # Resume uploaded before parsed forms were stored - parse once and persist
+            if file_path.endswith('.pdf'):
+                text = parser.extract_text_from_pdf(file_path)
+            else:
+                text = parser.extract_text_from_docx(file_path)
+            
+            parsed = build_parsed_resume(resume_id, text, skill_extractor, embedding_service)
+            parsed.save()
         
         # Restore to memory
         resume_storage[resume_id] = {
-            "text": text,
-            "skills": skills,
-            "domains": domains,
+            "parsed": parsed,
             "file_path": file_path,
             "user_id": user_id
         }
@@ -221,11 +472,11 @@ def root():
 
 # ==================== AUTHENTICATION ENDPOINTS ====================
 @app.post("/register", response_model=Token, tags=["Authentication"])
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     
     # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await db.scalar(select(User.id).where(User.email == user_data.email))
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -233,7 +484,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if username already exists
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_username = await db.scalar(select(User.id).where(User.username == user_data.username))
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -247,8 +498,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="Password must be at least 6 characters long"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user (bcrypt is slow on purpose - keep it off the event loop)
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     new_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -257,16 +508,13 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     print(f"✅ New user registered: {new_user.username}")
     
     # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": new_user.id}, expires_delta=access_token_expires
-    )
+    access_token = issue_access_token(new_user)
     
     return {
         "access_token": access_token,
@@ -276,11 +524,21 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         "email": new_user.email
     }
 
+def authenticate(email: str, password: str) -> Optional[User]:
+    """auth.authenticate_user on a short-lived sync session; the user comes back detached"""
+    db = SessionLocal()
+    try:
+        return authenticate_user(db, email, password)
+    finally:
+        db.close()
+
+
 @app.post("/login", response_model=Token, tags=["Authentication"])
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """Login user (username field accepts email)"""
     
-    user = authenticate_user(db, form_data.username, form_data.password)
+    # auth.authenticate_user is sync and hashes the password, so it gets its own session in a thread
+    user = await asyncio.to_thread(authenticate, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -289,16 +547,13 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
         )
     
     # Update last login
-    user.last_login = datetime.utcnow()
-    db.commit()
+    await db.execute(update(User).where(User.id == user.id).values(last_login=datetime.utcnow()))
+    await db.commit()
     
     print(f"✅ User logged in: {user.username}")
     
     # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
+    access_token = issue_access_token(user)
     
     return {
         "access_token": access_token,
@@ -310,12 +565,14 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
 
 @app.get("/profile", response_model=UserProfile, tags=["Authentication"])
 async def get_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user profile"""
     
-    resume_count = db.query(UserResume).filter(UserResume.user_id == current_user.id).count()
+    resume_count = await db.scalar(
+        select(func.count()).select_from(UserResume).where(UserResume.user_id == current_user.id)
+    )
     
     return {
         "id": current_user.id,
@@ -327,7 +584,7 @@ async def get_profile(
     }
 
 @app.post("/logout", tags=["Authentication"])
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: AuthenticatedUser = Depends(get_current_user)):
     """Logout user (client should delete token)"""
     print(f"✅ User logged out: {current_user.username}")
     return {"message": "Logged out successfully", "username": current_user.username}
@@ -336,10 +593,13 @@ async def logout(current_user: User = Depends(get_current_user)):
 @app.post("/upload-resume", response_model=ResumeUploadResponse, tags=["Resume"])
 async def upload_resume(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Upload and parse resume (PDF or DOCX) - Authenticated users only"""
+    """
+    Upload a resume (PDF or DOCX) - Authenticated users only.
+    Returns immediately with status "processing"; poll /resume/{resume_id}/status.
+    """
     
     print(f"📄 User {current_user.username} uploading: {file.filename}")
     
@@ -347,149 +607,128 @@ async def upload_resume(
     if not file.filename.endswith(('.pdf', '.docx')):
         raise HTTPException(status_code=400, detail="Only PDF and DOCX files supported")
     
+    if file.size is not None and file.size > settings.max_upload_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=size_limit_message(settings.max_upload_bytes)
+        )
+    
+    # Backpressure: refuse new work while the pipeline is saturated
+    if upload_pipeline.is_full():
+        raise HTTPException(
+            status_code=503,
+            detail="Too many resumes are being processed. Please try again shortly.",
+            headers={"Retry-After": "10"}
+        )
+    
     print("✅ File validation passed")
     
-    # Save file temporarily
+    # Save file for the workers
     resume_id = str(uuid.uuid4())
     file_extension = file.filename.split('.')[-1]
-    file_path = f"{settings.upload_dir}/{resume_id}.{file_extension}"
-    
-    print(f"💾 Saving to: {file_path}")
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    print("✅ File saved")
-    
-    # Extract text
-    try:
-        print("📖 Extracting text...")
-        if file_extension == 'pdf':
-            text = parser.extract_text_from_pdf(file_path)
-        else:
-            text = parser.extract_text_from_docx(file_path)
-        print(f"✅ Text extracted: {len(text)} characters")
-        
-        if not text or len(text.strip()) < 10:
-            raise ValueError("Extracted text is too short or empty. Please upload a valid resume.")
-            
-    except Exception as e:
-        print(f"❌ Error parsing: {e}")
-        raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
-    
-    # Extract skills and domains
-    print("🔍 Extracting skills...")
-    try:
-        skills = skill_extractor.extract_skills(text)
-        print(f"✅ Found {len(skills)} skills: {skills[:5]}")
-        
-        domains = skill_extractor.identify_domains(skills)
-        print(f"✅ Identified domains: {domains}")
-    except Exception as e:
-        print(f"❌ Error extracting skills: {e}")
-        skills = []
-        domains = []
+    staging_path = blob_store.staging_path(resume_id, file_extension)
     
-    # Generate and store embeddings
+    # Stream to disk in chunks, hashing and checking the file signature on the way
     try:
-        print("🧠 Generating embeddings...")
-        
-        # Truncate text if too long
-        max_chars = 5000
-        text_for_embedding = text[:max_chars] if len(text) > max_chars else text
-        
-        print(f"Text length for embedding: {len(text_for_embedding)} chars")
-        
-        # Generate embedding
-        embedding = embedding_service.generate_embedding(text_for_embedding)
-        print(f"Embedding type: {type(embedding)}, length: {len(embedding)}")
-        
-        # Convert to numpy array
-        if isinstance(embedding, list):
-            embedding_array = np.array([embedding]).astype('float32')
-        else:
-            embedding_array = np.array([embedding.tolist()]).astype('float32')
-        
-        print(f"Embedding array shape: {embedding_array.shape}")
-        
-        # Verify dimension
-        if embedding_array.shape[1] != settings.vector_dimension:
-            raise ValueError(
-                f"Embedding dimension mismatch: got {embedding_array.shape[1]}, "
-                f"expected {settings.vector_dimension}"
-            )
-        
-        vector_store.add_documents(
-            embeddings=embedding_array,
-            documents=[text_for_embedding],
-            metadata=[{"resume_id": resume_id, "user_id": current_user.id, "type": "resume"}]
-        )
-        vector_store.save()
-        print("✅ Embeddings stored successfully")
-        
-    except Exception as e:
-        print(f"❌ Error generating embeddings: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error generating embeddings: {str(e)}"
+        upload = await stream_upload(
+            file, staging_path, file_extension, settings.max_upload_bytes, settings.upload_chunk_bytes
         )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadTypeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Store resume data in memory
-    resume_storage[resume_id] = {
-        "text": text,
-        "skills": skills,
-        "domains": domains,
-        "file_path": file_path,
-        "user_id": current_user.id
-    }
+    # Content-addressed: identical files (from any user) are stored once
+    file_path = blob_store.put(staging_path, upload.sha256, file_extension)
+    print(f"✅ File saved to {file_path} ({upload.size} bytes)")
     
-    # Save to database
+    # Record ownership now so status checks work; counts are filled in when processing finishes
     try:
         user_resume = UserResume(
             user_id=current_user.id,
             resume_id=resume_id,
             filename=file.filename,
-            skills_count=len(skills),
-            extracted_text=text[:1000]
+            skills_count=0,
+            extracted_text=""
         )
         db.add(user_resume)
+        blob_store.attach(db, resume_id, upload.sha256, file_extension, upload.size, file_path)
         db.commit()
-        print(f"✅ Resume saved to DB for user: {current_user.username}")
     except Exception as e:
         print(f"❌ Error saving to DB: {e}")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error saving resume: {str(e)}")
+    finally:
+        # Reference committed (or not): the staged copy of a reused blob can go
+        blob_store.settle(staging_path, file_path)
     
-    print(f"✅ Resume stored with ID: {resume_id}")
+    # Parsing and embedding happen in the background worker pools
+    upload_pipeline.hold(resume_id, upload.data)
+    upload_queue.enqueue(resume_id, current_user.id, file.filename, file_path)
+    print(f"📥 Resume {resume_id} queued for processing")
     
     return ResumeUploadResponse(
         resume_id=resume_id,
+        status="processing",
+        stage=STAGE_PARSE,
+        extracted_text="",
+        skills=[],
+        domains=[]
+    )
+
+
+@app.get("/resume/{resume_id}/status", response_model=ResumeUploadResponse, tags=["Resume"])
+async def resume_status(
+    resume_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Processing status of an uploaded resume; includes results once done"""
+    
+    if not owns_resume(resume_id, current_user.id, db):
+        raise HTTPException(status_code=404, detail="Resume not found or access denied")
+    
+    job = upload_queue.get(resume_id)
+    if job and job["status"] != "done":
+        return ResumeUploadResponse(
+            resume_id=resume_id,
+            status="failed" if job["status"] == "failed" else "processing",
+            stage=job["stage"],
+            error=job["error"],
+            extracted_text="",
+            skills=[],
+            domains=[]
+        )
+    
+    # Finished (or uploaded before the queue existed)
+    parsed = get_resume_data(resume_id, current_user.id, db)["parsed"]
+    text = parsed.text
+    return ResumeUploadResponse(
+        resume_id=resume_id,
+        status="done",
+        stage=STAGE_DONE,
         extracted_text=text[:500] + "..." if len(text) > 500 else text,
-        skills=skills,
-        domains=domains
+        skills=parsed.skills,
+        domains=parsed.domains
     )
 
 @app.post("/job-match", response_model=JobMatchResponse, tags=["Analysis"])
 async def job_match(
     request: JobMatchRequest,
-    current_user: User = Depends(get_current_user),
+    context: RequestContext = Depends(get_request_context),
     db: Session = Depends(get_db)
 ):
     """Match resume with job description - Authenticated users only"""
     
+    # User and resume ownership come from one joined query
+    current_user, resume = await context.user_and_resume(request.resume_id)
+    
     print(f"🎯 Job matching for user: {current_user.username}")
     print(f"Resume ID: {request.resume_id}")
     print(f"Job description length: {len(request.job_description)}")
     
     # Verify resume belongs to current user
-    user_resume = db.query(UserResume).filter(
-        UserResume.resume_id == request.resume_id,
-        UserResume.user_id == current_user.id
-    ).first()
-    
-    if not user_resume:
+    if resume is None:
         print(f"❌ Resume not found in DB for user {current_user.username}")
         raise HTTPException(
             status_code=403,
@@ -498,7 +737,7 @@ async def job_match(
     
     # Get resume data (reload from DB if not in memory)
     try:
-        resume_data = get_resume_data(request.resume_id, current_user.id, db)
+        resume_data = get_resume_data(request.resume_id, current_user.id, db, owned=True)
     except HTTPException:
         raise
     except Exception as e:
@@ -509,37 +748,33 @@ async def job_match(
         )
     
     try:
-        # Analyze match using RAG
-        result = rag_service.analyze_job_match(
-            resume_text=resume_data["text"],
-            job_description=request.job_description,
-            resume_skills=resume_data["skills"]
+        # Parse the job description once; repeated JDs come from the registry.
+        # First sight embeds and commits, so it runs off the event loop too
+        job = await asyncio.to_thread(jd_registry.resolve, db, request.job_description)
+        
+        # Analyze match using RAG (LLM waits and retries run off the event loop)
+        result = await asyncio.to_thread(
+            rag_service.analyze_job_match,
+            resume=resume_data["parsed"],
+            job=job
         )
         
         print(f"✅ Job match completed with score: {result.get('match_score', 0)}")
         
-        # ✅ SAVE MATCH HISTORY TO DATABASE
-        try:
-            # Extract job title (first line of JD)
-            job_title = request.job_description.split('\n')[0][:100] if request.job_description else "Job Position"
-            
-            match_history = JobMatchHistory(
-                user_id=current_user.id,
-                resume_id=request.resume_id,
-                job_description=request.job_description[:5000],  # Limit to 5000 chars
-                job_title=job_title,
-                match_score=result['match_score'],
-                matched_skills=result['matched_skills'],
-                missing_skills=result['missing_skills'],
-                recommendations=result['recommendations']
-            )
-            
-            db.add(match_history)
-            db.commit()
-            print(f"✅ Saved match history ID: {match_history.id}")
-        except Exception as e:
-            print(f"⚠️ Failed to save match history: {e}")
-            # Don't fail the request if history save fails
+        # ✅ SAVE MATCH HISTORY - buffered and committed in the next batch
+        # Full JD text lives once in the registry; history keeps a short preview
+        history_writer.add_match(JobMatchHistory(
+            user_id=current_user.id,
+            resume_id=request.resume_id,
+            job_description=job.text[:settings.jd_preview_chars],
+            job_title=job.job_title,
+            match_score=result['match_score'],
+            matched_skills=result['matched_skills'],
+            missing_skills=result['missing_skills'],
+            recommendations=result['recommendations'],
+            created_at=datetime.utcnow()
+        ), job.jd_hash)
+        print(f"✅ Queued match history for user: {current_user.username}")
         
         return JobMatchResponse(**result)
     except Exception as e:
@@ -552,18 +787,14 @@ async def job_match(
 @app.post("/career-advice", response_model=CareerAdviceResponse, tags=["Analysis"])
 async def career_advice(
     request: CareerAdviceRequest,
-    current_user: User = Depends(get_current_user),
+    context: RequestContext = Depends(get_request_context),
     db: Session = Depends(get_db)
 ):
     """Get personalized career advice - Authenticated users only"""
     
     # Verify resume belongs to current user
-    user_resume = db.query(UserResume).filter(
-        UserResume.resume_id == request.resume_id,
-        UserResume.user_id == current_user.id
-    ).first()
-    
-    if not user_resume:
+    current_user, resume = await context.user_and_resume(request.resume_id)
+    if resume is None:
         raise HTTPException(
             status_code=403,
             detail="Resume not found or access denied"
@@ -571,7 +802,7 @@ async def career_advice(
     
     # Get resume data (reload from DB if not in memory)
     try:
-        resume_data = get_resume_data(request.resume_id, current_user.id, db)
+        resume_data = get_resume_data(request.resume_id, current_user.id, db, owned=True)
     except HTTPException:
         raise
     
@@ -581,29 +812,29 @@ async def career_advice(
     
     try:
         # Get AI response
-        answer, context = rag_service.get_career_advice(
+        answer, relevant_context = await asyncio.to_thread(
+            rag_service.get_career_advice,
             query=request.query,
-            resume_text=resume_data["text"],
-            resume_id=request.resume_id
+            resume=resume_data["parsed"],
+            user_id=current_user.id
         )
         
         print(f"✅ Generated career advice ({len(answer)} chars)")
         
-        # ✅ Save to chat history database
-        chat_entry = ChatHistory(
+        # ✅ Save to chat history - buffered and committed in the next batch
+        history_writer.add_chat(ChatHistory(
             user_id=current_user.id,
             resume_id=request.resume_id,
             user_query=request.query,
-            ai_response=answer
-        )
-        db.add(chat_entry)
-        db.commit()
-        print(f"💾 Saved chat to history (ID: {chat_entry.id})")
+            ai_response=answer,
+            created_at=datetime.utcnow()
+        ))
+        print(f"💾 Queued chat for history (user: {current_user.username})")
         
         # Return response
         return CareerAdviceResponse(
             answer=answer,
-            relevant_context=context
+            relevant_context=relevant_context
         )
         
     except Exception as e:
@@ -614,55 +845,94 @@ async def career_advice(
 
 
 
+# Columns a history list can return with ?fields=; "summary" leaves out the long texts
+CHAT_FIELDS = {
+    "id": ChatHistory.id,
+    "resume_id": ChatHistory.resume_id,
+    "user_query": ChatHistory.user_query,
+    "ai_response": ChatHistory.ai_response,
+    "created_at": ChatHistory.created_at,
+}
+CHAT_FIELD_PRESETS = {"summary": ["id", "resume_id", "user_query", "created_at"]}
+
+
+def serialize_row(row, names: List[str]) -> dict:
+    item = {name: getattr(row, name) for name in names}
+    item["created_at"] = item["created_at"].isoformat()
+    return item
+
+
 @app.get("/chat-history", tags=["Analysis"])
 async def get_chat_history(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    """Get user's chat history"""
+    """
+    Get user's chat history, newest first, one page at a time.
+    Pass next_cursor back as ?cursor= for the following page; ?fields=summary
+    (or a comma-separated list) returns only those columns.
+    """
+    await flush_pending_history(current_user.id)
     try:
-        chats = db.query(ChatHistory)\
-            .filter(ChatHistory.user_id == current_user.id)\
-            .order_by(ChatHistory.created_at.desc())\
-            .all()
-        
-        print(f"📜 Fetched {len(chats)} chat history entries for user: {current_user.username}")
-        
-        return {
-            "chats": [
-                {
-                    "id": chat.id,
-                    "user_query": chat.user_query,
-                    "ai_response": chat.ai_response,
-                    "resume_id": chat.resume_id,
-                    "created_at": chat.created_at.isoformat()
-                }
-                for chat in chats
-            ]
-        }
+        names = select_fields(fields, CHAT_FIELDS, CHAT_FIELD_PRESETS)
+        query = select(*[CHAT_FIELDS[name].label(name) for name in names])\
+            .where(ChatHistory.user_id == current_user.id)
+        chats, next_cursor = await keyset_page(db, query, ChatHistory.created_at, ChatHistory.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"❌ Error fetching chat history: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    print(f"📜 Fetched {len(chats)} chat history entries for user: {current_user.username}")
+    
+    return {
+        "chats": [serialize_row(chat, names) for chat in chats],
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
+    }
+
+
+@app.get("/chat-history/{chat_id}", tags=["Analysis"])
+async def get_chat(
+    chat_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get one chat with its full answer"""
+    await flush_pending_history(current_user.id)
+    chat = await db.scalar(select(ChatHistory).where(
+        ChatHistory.id == chat_id,
+        ChatHistory.user_id == current_user.id
+    ))
+    
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found")
+    
+    return serialize_row(chat, list(CHAT_FIELDS))
 
 
 @app.delete("/chat-history/{chat_id}", tags=["Analysis"])
 async def delete_chat(
     chat_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a specific chat from history"""
+    await flush_pending_history(current_user.id)
     try:
-        chat = db.query(ChatHistory).filter(
+        result = await db.execute(delete(ChatHistory).where(
             ChatHistory.id == chat_id,
             ChatHistory.user_id == current_user.id
-        ).first()
+        ))
         
-        if not chat:
+        if not result.rowcount:
             raise HTTPException(status_code=404, detail="Chat not found")
         
-        db.delete(chat)
-        db.commit()
+        await db.commit()
         
         print(f"🗑️ Deleted chat {chat_id} for user: {current_user.username}")
         
@@ -676,16 +946,81 @@ async def delete_chat(
 
 
 
+@app.get("/dashboard", tags=["Analysis"])
+async def get_dashboard(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Home page stats: counts, scores and recent activity computed in SQL"""
+    user_id = current_user.id
+    await flush_pending_history(user_id)
+    
+    def scalar(column, model, order_by=None):
+        query = select(column).where(model.user_id == user_id)
+        if order_by is not None:
+            query = query.order_by(order_by).limit(1)
+        return query.scalar_subquery()
+    
+    # One statement: each figure is an aggregate subquery over the user's rows
+    stats = (await db.execute(select(
+        scalar(func.count(), UserResume).label("resume_count"),
+        scalar(func.coalesce(func.sum(UserResume.skills_count), 0), UserResume).label("total_skills"),
+        scalar(UserResume.skills_count, UserResume, UserResume.uploaded_at.desc()).label("latest_resume_skills"),
+        scalar(func.count(), JobMatchHistory).label("match_count"),
+        scalar(func.max(JobMatchHistory.match_score), JobMatchHistory).label("best_match_score"),
+        scalar(func.avg(JobMatchHistory.match_score), JobMatchHistory).label("avg_match_score"),
+        scalar(func.count(), ChatHistory).label("advice_count"),
+    ))).one()
+    
+    recent = union_all(
+        select(
+            literal("match").label("type"), JobMatchHistory.id.label("id"),
+            JobMatchHistory.job_title.label("title"), JobMatchHistory.match_score.label("score"),
+            JobMatchHistory.created_at.label("created_at")
+        ).where(JobMatchHistory.user_id == user_id),
+        select(
+            literal("advice").label("type"), ChatHistory.id.label("id"),
+            func.substr(ChatHistory.user_query, 1, 80).label("title"), literal(None).label("score"),
+            ChatHistory.created_at.label("created_at")
+        ).where(ChatHistory.user_id == user_id),
+    ).subquery()
+    activity = (await db.execute(
+        select(recent).order_by(recent.c.created_at.desc()).limit(5)
+    )).all()
+    
+    return {
+        "resume_count": stats.resume_count,
+        "total_skills": stats.total_skills,
+        "latest_resume_skills": stats.latest_resume_skills or 0,
+        "match_count": stats.match_count,
+        "best_match_score": round(stats.best_match_score or 0, 1),
+        "avg_match_score": round(stats.avg_match_score or 0, 1),
+        "advice_count": stats.advice_count,
+        "recent_activity": [
+            {
+                "type": item.type,
+                "id": item.id,
+                "title": item.title,
+                "score": item.score,
+                "created_at": item.created_at.isoformat() if isinstance(item.created_at, datetime) else item.created_at
+            }
+            for item in activity
+        ]
+    }
+
+
 @app.get("/my-resumes", tags=["Resume"])
 async def get_my_resumes(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all resumes for current authenticated user"""
     
-    resumes = db.query(UserResume).filter(
+    resumes = (await db.execute(select(UserResume, ResumeFile).outerjoin(
+        ResumeFile, ResumeFile.resume_id == UserResume.resume_id
+    ).where(
         UserResume.user_id == current_user.id
-    ).order_by(UserResume.uploaded_at.desc()).all()
+    ).order_by(UserResume.uploaded_at.desc()))).all()
     
     return {
         "count": len(resumes),
@@ -696,9 +1031,11 @@ async def get_my_resumes(
                 "resume_id": r.resume_id,
                 "filename": r.filename,
                 "uploaded_at": r.uploaded_at.isoformat(),
-                "skills_count": r.skills_count
+                "skills_count": r.skills_count,
+                # Signed link (None for files not yet in the blob store - use /view-url)
+                "view_url": view_signer.sign(r.resume_id, blob_store.blob_name(f), r.filename) if f else None
             }
-            for r in resumes
+            for r, f in resumes
         ]
     }
 
@@ -706,12 +1043,11 @@ async def get_my_resumes(
 
 @app.delete("/delete-account", tags=["User"])
 async def delete_account(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Delete user account and all associated data
-    - Deletes all user resumes
+    - Deletes resumes, files, vectors, match and chat history
     - Deletes user record
     - Cannot be undone!
     """
@@ -721,31 +1057,12 @@ async def delete_account(
         
         print(f"🗑️ Deleting account for user: {username} (ID: {user_id})")
         
-        # 1. Delete all user's resumes from database
-        user_resumes = db.query(UserResume).filter(UserResume.user_id == user_id).all()
-        
-        # Delete physical resume files
-        import os
-        for resume in user_resumes:
-            file_path = f"uploads/{resume.resume_id}.pdf"
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                print(f"   ✓ Deleted file: {file_path}")
-            
-            # Also try .docx
-            docx_path = f"uploads/{resume.resume_id}.docx"
-            if os.path.exists(docx_path):
-                os.remove(docx_path)
-                print(f"   ✓ Deleted file: {docx_path}")
-        
-        # Delete resume records from database
-        db.query(UserResume).filter(UserResume.user_id == user_id).delete()
-        print(f"   ✓ Deleted {len(user_resumes)} resume records")
-        
-        # 2. Delete user account
-        db.delete(current_user)
-        db.commit()
+        # Bulk deletes in one transaction; files are removed in the background
+        result = await asyncio.to_thread(account_deletion.delete, user_id)
+        # Outstanding tokens must stop resolving in this process right away
+        user_cache.invalidate(user_id, revoke_seconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
         
+        print(f"   ✓ Deleted {len(result.resume_ids)} resumes, {result.vectors} vectors, rows: {result.rows}")
         print(f"✅ Account deleted successfully: {username}")
         
         return {
@@ -754,7 +1071,6 @@ async def delete_account(
         }
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Error deleting account: {str(e)}")
         raise HTTPException(
             status_code=500,
@@ -768,6 +1084,7 @@ async def delete_account(
 async def view_resume(
     resume_id: str,
     token: str,  # ✅ Get token from query parameter (?token=...)
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """View/download resume file (token authentication via URL query)"""
@@ -817,18 +1134,9 @@ async def view_resume(
         )
     
     # Find the file
-    file_extensions = ['pdf', 'docx']
-    file_path = None
-    media_type = None
-    
-    for ext in file_extensions:
-        potential_path = f"{settings.upload_dir}/{resume_id}.{ext}"
-        if os.path.exists(potential_path):
-            file_path = potential_path
-            media_type = "application/pdf" if ext == "pdf" else "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            break
+    record = ensure_resume_blob(resume_id, db)
     
-    if not file_path:
+    if not record or not os.path.exists(record.path):
         raise HTTPException(
             status_code=404,
             detail="Resume file not found"
@@ -836,20 +1144,69 @@ async def view_resume(
     
     print(f"✅ Serving resume: {user_resume.filename} to {current_user.username}")
     
-    # Return file with original filename
-    return FileResponse(
-        path=file_path,
-        media_type=media_type,
-        filename=user_resume.filename,
-        headers={
-            "Content-Disposition": f"inline; filename={user_resume.filename}"
-        }
+    # Return file with original filename; repeat views revalidate to a 304
+    return conditional_file_response(
+        request, record.path, record.media_type, user_resume.filename, record.sha256,
+        cache_control="private, no-cache"
+    )
+
+
+@app.get("/resume/{resume_id}/view-url", tags=["Resume"])
+async def get_resume_view_url(
+    resume_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Short-lived signed link for viewing a resume without sending the login token"""
+    
+    user_resume = db.query(UserResume).filter(
+        UserResume.resume_id == resume_id,
+        UserResume.user_id == current_user.id
+    ).first()
+    
+    if not user_resume:
+        raise HTTPException(status_code=404, detail="Resume not found or access denied")
+    
+    record = ensure_resume_blob(resume_id, db)
+    if not record:
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    
+    return {
+        "url": view_signer.sign(resume_id, blob_store.blob_name(record), user_resume.filename),
+        "expires_at": view_signer.expiry()
+    }
+
+
+@app.get("/resume/{resume_id}/file", tags=["Resume"])
+async def view_resume_signed(
+    resume_id: str,
+    blob: str,
+    name: str,
+    expires: int,
+    sig: str,
+    request: Request
+):
+    """View a resume through a signed link from /resume/{id}/view-url (no DB access)"""
+    
+    if not view_signer.verify(resume_id, blob, name, expires, sig):
+        raise HTTPException(status_code=403, detail="Link is invalid or has expired")
+    
+    path = blob_store.path_for_blob(blob)
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    
+    sha256, _, extension = blob.partition(".")
+    # Content never changes for a blob name, so the link can be cached until it expires
+    max_age = max(0, expires - int(time.time()))
+    return conditional_file_response(
+        request, path, MEDIA_TYPES[extension], name, sha256,
+        cache_control=f"private, max-age={max_age}, immutable"
     )
 
 @app.delete("/resume/{resume_id}", tags=["Resume"])
 async def delete_resume(
     resume_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a resume (owner only)"""
@@ -866,17 +1223,30 @@ async def delete_resume(
             detail="Resume not found or you don't have permission to delete it"
         )
     
+    # Stop background processing first; a resume being published finishes before cancel returns
+    upload_queue.delete(resume_id)
+    await asyncio.to_thread(upload_pipeline.cancel, [resume_id])
+    
+    # Drop cached career advice for this resume
+    if rag_service.semantic_cache:
+        rag_service.semantic_cache.invalidate(resume_id)
+    
     # Delete file if exists
-    if resume_id in resume_storage:
-        file_path = resume_storage[resume_id]["file_path"]
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        del resume_storage[resume_id]
+    remove_resume_file(resume_id, db)
+    resume_storage.pop(resume_id, None)
+    ParsedResume.delete(resume_id)
+    
+    # Tombstone its vectors (whole-resume and section chunks)
+    removed_vectors = vector_store.remove_resumes([resume_id])
     
     # Delete from database
     db.delete(user_resume)
     db.commit()
     
+    # Persist the tombstones so the resume text is gone from disk too
+    if removed_vectors:
+        await asyncio.to_thread(vector_store.save)
+    
     print(f"✅ Resume deleted by {current_user.username}: {resume_id}")
     
     return {"message": "Resume deleted successfully", "resume_id": resume_id}
@@ -889,62 +1259,110 @@ def health_check():
         "service": "Career Compass API",
         "version": "2.0.0",
         "database": "connected",
-        "resumes_in_memory": len(resume_storage)
+        "resumes_in_memory": len(resume_storage),
+        "user_cache": user_cache.stats(),
+        "history_writer": history_writer.stats(),
+        "llm_gateway": rag_service.llm.stats(),
+        "llm_cache": rag_service.llm_cache.stats() if rag_service.llm_cache else None,
+        "semantic_cache": rag_service.semantic_cache.stats() if rag_service.semantic_cache else None
     }
 
 
 
+# Full job description text comes from the JD registry (history stores a preview)
+MATCH_FIELDS = {
+    "id": JobMatchHistory.id,
+    "resume_id": JobMatchHistory.resume_id,
+    "job_title": JobMatchHistory.job_title,
+    "job_description": func.coalesce(JobDescription.text, JobMatchHistory.job_description),
+    "match_score": JobMatchHistory.match_score,
+    "matched_skills": JobMatchHistory.matched_skills,
+    "missing_skills": JobMatchHistory.missing_skills,
+    "recommendations": JobMatchHistory.recommendations,
+    "created_at": JobMatchHistory.created_at,
+}
+MATCH_FIELD_PRESETS = {"summary": ["id", "resume_id", "job_title", "match_score", "created_at"]}
+
+
+def match_query(names: List[str]):
+    query = select(*[MATCH_FIELDS[name].label(name) for name in names]).select_from(JobMatchHistory)
+    if "job_description" in names:
+        query = query.outerjoin(
+            JobMatchDescription, JobMatchDescription.match_id == JobMatchHistory.id
+        ).outerjoin(
+            JobDescription, JobDescription.jd_hash == JobMatchDescription.jd_hash
+        )
+    return query
+
+
 @app.get("/match-history", tags=["Analysis"])
 async def get_match_history(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    limit: int = 20
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    """Get user's job match history"""
-    
-    matches = db.query(JobMatchHistory).filter(
-        JobMatchHistory.user_id == current_user.id
-    ).order_by(
-        JobMatchHistory.created_at.desc()
-    ).limit(limit).all()
+    """
+    Get user's job match history, newest first, one page at a time.
+    Pass next_cursor back as ?cursor= for the following page; ?fields=summary
+    (or a comma-separated list) returns only those columns.
+    """
+    await flush_pending_history(current_user.id)
+    try:
+        names = select_fields(fields, MATCH_FIELDS, MATCH_FIELD_PRESETS)
+        query = match_query(names).where(JobMatchHistory.user_id == current_user.id)
+        matches, next_cursor = await keyset_page(db, query, JobMatchHistory.created_at, JobMatchHistory.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "count": len(matches),
-        "matches": [
-            {
-                "id": match.id,
-                "resume_id": match.resume_id,
-                "job_title": match.job_title,
-                "job_description": match.job_description,
-                "match_score": match.match_score,
-                "matched_skills": match.matched_skills,
-                "missing_skills": match.missing_skills,
-                "recommendations": match.recommendations,
-                "created_at": match.created_at.isoformat()
-            }
-            for match in matches
-        ]
+        "matches": [serialize_row(match, names) for match in matches],
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
     }
 
 
+@app.get("/match-history/{match_id}", tags=["Analysis"])
+async def get_match(
+    match_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get one job match with its full job description"""
+    await flush_pending_history(current_user.id)
+    names = list(MATCH_FIELDS)
+    match = (await db.execute(match_query(names).where(
+        JobMatchHistory.id == match_id,
+        JobMatchHistory.user_id == current_user.id
+    ))).first()
+    
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+    
+    return serialize_row(match, names)
+
+
 @app.delete("/match-history/{match_id}", tags=["Analysis"])
 async def delete_match_history(
     match_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a specific match from history"""
+    await flush_pending_history(current_user.id)
     
-    match = db.query(JobMatchHistory).filter(
+    result = await db.execute(delete(JobMatchHistory).where(
         JobMatchHistory.id == match_id,
         JobMatchHistory.user_id == current_user.id
-    ).first()
+    ))
     
-    if not match:
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Match not found")
     
-    db.delete(match)
-    db.commit()
+    await db.execute(delete(JobMatchDescription).where(JobMatchDescription.match_id == match_id))
+    await db.commit()
     
     return {"success": True, "message": "Match deleted"}
 
@@ -0,0 +1,55 @@
+# Idempotent schema migrations run at startup, after create_all().
+#
+# create_all() only creates missing tables, so indexes added after a table
+# already exists have to be created here. Each one is skipped when an
+# existing index already starts with the same columns.
+from typing import List, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+
+# (name, table, columns) matching how the API filters and orders each table
+INDEXES: List[Tuple[str, str, Tuple[str, ...]]] = [
+    # Ownership check: WHERE resume_id = ? AND user_id = ? answered from the index alone
+    ("ix_user_resumes_resume_user", "user_resumes", ("resume_id", "user_id")),
+    # /my-resumes and /dashboard: WHERE user_id = ? ORDER BY uploaded_at DESC
+    ("ix_user_resumes_user_uploaded", "user_resumes", ("user_id", "uploaded_at")),
+    # History pages: WHERE user_id = ? ORDER BY created_at DESC, id DESC (keyset cursor)
+    ("ix_job_match_history_user_created", "job_match_history", ("user_id", "created_at", "id")),
+    ("ix_chat_history_user_created", "chat_history", ("user_id", "created_at", "id")),
+    # Login and registration lookups
+    ("ix_users_email", "users", ("email",)),
+    ("ix_users_username", "users", ("username",)),
+]
+
+
+def _covered(existing: List[Tuple[str, ...]], columns: Tuple[str, ...]) -> bool:
+    return any(index[:len(columns)] == columns for index in existing)
+
+
+def ensure_indexes(engine: Engine) -> List[str]:
+    """Create any missing access-pattern indexes; returns the names created"""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    created = []
+
+    with engine.begin() as conn:
+        for name, table, columns in INDEXES:
+            if table not in tables:
+                continue
+            existing = [tuple(index["column_names"]) for index in inspector.get_indexes(table)]
+            existing += [tuple(inspector.get_pk_constraint(table)["constrained_columns"])]
+            for constraint in inspector.get_unique_constraints(table):
+                existing.append(tuple(constraint["column_names"]))
+            if _covered(existing, columns):
+                continue
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+            created.append(name)
+
+        if created and engine.dialect.name == "sqlite":
+            # Refresh planner statistics so the new indexes get used
+            conn.execute(text("PRAGMA optimize"))
+
+    if created:
+        print(f"✅ Created indexes: {', '.join(created)}")
+    return created
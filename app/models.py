@@ -4,6 +4,9 @@ from typing import List, Optional
 
 class ResumeUploadResponse(BaseModel):
     resume_id: str
+    status: str = "done"  # processing | done | failed
+    stage: Optional[str] = None
+    error: Optional[str] = None
     extracted_text: str
     skills: List[str]
     domains: List[str]
@@ -26,6 +29,7 @@ class JobMatchResponse(BaseModel):
     match_score: float = Field(ge=0, le=100)
     matched_skills: List[str]
     missing_skills: List[str]
+    partial_matches: List[str] = []
     recommendations: str
 
 
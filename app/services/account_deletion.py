@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import delete, exists, select
+from sqlalchemy.orm import Session, aliased
+from app.config import get_settings
+from app.db_models import JobMatchDescription, ResumeFile
+from app.services.blob_store import BlobStore
+from app.services.history_writer import HistoryWriter
+from app.services.job_queue import JobQueue
+from app.services.parsed_resume import ParsedResume
+from app.services.semantic_cache import SemanticCache
+from app.services.upload_pipeline import UploadPipeline
+from app.services.upload_stream import MEDIA_TYPES
+from app.services.vector_store import VectorStore
+from models import User, UserResume, JobMatchHistory, ChatHistory
+
+
+@dataclass(slots=True)
+class DeletionResult:
+    resume_ids: List[str] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    vectors: int = 0
+
+
+class AccountDeletion:
+    """
+    Removes everything a user owns. Database rows go in a fixed number of bulk
+    statements in one transaction, in-memory state and vectors are dropped right
+    after, and files (blobs, parsed forms, the vector index) are cleaned up by a
+    single background worker, so the request time doesn't grow with file count.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        blob_store: BlobStore,
+        vector_store: VectorStore,
+        upload_queue: JobQueue,
+        upload_pipeline: UploadPipeline,
+        history_writer: HistoryWriter,
+        semantic_cache: Optional[SemanticCache],
+        resume_storage: Dict[str, dict]
+    ):
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.blob_store = blob_store
+        self.vector_store = vector_store
+        self.upload_queue = upload_queue
+        self.upload_pipeline = upload_pipeline
+        self.history_writer = history_writer
+        self.semantic_cache = semantic_cache
+        self.resume_storage = resume_storage
+        self._cleanup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="account-cleanup")
+
+    def delete(self, user_id: str) -> DeletionResult:
+        """Delete a user and all their data; file cleanup continues in the background"""
+        # Buffered history rows must not be written after the account is gone
+        self.history_writer.discard(user_id)
+
+        result = DeletionResult()
+        db = self.session_factory()
+        try:
+            owned = select(UserResume.resume_id).where(UserResume.user_id == user_id)
+            result.resume_ids = list(db.scalars(owned))
+
+            # Blobs only this user's resumes point at can go once the rows are gone
+            other = aliased(ResumeFile)
+            shared = exists().where(other.sha256 == ResumeFile.sha256, other.resume_id.not_in(owned))
+            blobs = {
+                sha256: path for sha256, path in db.execute(
+                    select(ResumeFile.sha256, ResumeFile.path)
+                    .where(ResumeFile.resume_id.in_(owned), ~shared)
+                    .distinct()
+                )
+            }
+            # Resumes uploaded before the blob store have no resume_files row
+            legacy = set(result.resume_ids) - set(db.scalars(
+                select(ResumeFile.resume_id).where(ResumeFile.resume_id.in_(owned))
+            ))
+
+            matches = select(JobMatchHistory.id).where(JobMatchHistory.user_id == user_id)
+            statements = [
+                ("job_match_descriptions", delete(JobMatchDescription).where(JobMatchDescription.match_id.in_(matches))),
+                ("job_match_history", delete(JobMatchHistory).where(JobMatchHistory.user_id == user_id)),
+                ("chat_history", delete(ChatHistory).where(ChatHistory.user_id == user_id)),
+                ("resume_files", delete(ResumeFile).where(ResumeFile.resume_id.in_(owned))),
+                ("user_resumes", delete(UserResume).where(UserResume.user_id == user_id)),
+                ("users", delete(User).where(User.id == user_id)),
+            ]
+            for table, statement in statements:
+                result.rows[table] = db.execute(
+                    statement, execution_options={"synchronize_session": False}
+                ).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        # In-process state: cheap dictionary and index operations. Upload jobs go
+        # first, so nothing still in the pipeline publishes after the cleanup
+        self.upload_queue.delete_many(result.resume_ids)
+        self.upload_pipeline.cancel(result.resume_ids)
+        for resume_id in result.resume_ids:
+            self.resume_storage.pop(resume_id, None)
+            if self.semantic_cache:
+                self.semantic_cache.invalidate(resume_id)
+        result.vectors = self.vector_store.remove_resumes(result.resume_ids)
+
+        self._cleanup_pool.submit(self._cleanup_files, result.resume_ids, blobs, sorted(legacy))
+        return result
+
+    def _cleanup_files(self, resume_ids: List[str], blobs: Dict[str, str], legacy: List[str]):
+        try:
+            db = self.session_factory()
+            try:
+                blobs_removed = self.blob_store.purge(db, blobs)
+            finally:
+                db.close()
+
+            legacy_removed = 0
+            for resume_id in legacy:
+                for ext in MEDIA_TYPES:
+                    path = os.path.join(self.settings.upload_dir, f"{resume_id}.{ext}")
+                    if os.path.exists(path):
+                        os.remove(path)
+                        legacy_removed += 1
+            for resume_id in resume_ids:
+                ParsedResume.delete(resume_id)
+
+            # Persist the tombstones so deleted text is gone from disk too
+            self.vector_store.save()
+            print(f"🧹 Account cleanup: {blobs_removed} blobs, {legacy_removed} legacy files, "
+                  f"{len(resume_ids)} parsed resumes removed")
+        except Exception as e:
+            print(f"⚠️ Account file cleanup failed: {e}")
+
+    def shutdown(self):
+        """Finish queued file cleanups"""
+        self._cleanup_pool.shutdown(wait=True)
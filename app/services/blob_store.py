@@ -0,0 +1,151 @@
+import hashlib
+import os
+import uuid
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.db_models import ResumeFile
+from app.services.upload_stream import MEDIA_TYPES
+
+
+class BlobStore:
+    """
+    Content-addressed file storage: each distinct file is stored once at
+    blobs/ab/cd/<sha256>.<ext>, and resume_files rows point resumes at it.
+    Two directory levels keep every directory small even with millions of files.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.settings = get_settings()
+        self.root = root or os.path.join(self.settings.upload_dir, "blobs")
+        self.staging_dir = os.path.join(self.root, "incoming")
+        os.makedirs(self.staging_dir, exist_ok=True)
+
+    def path_for(self, sha256: str, extension: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], f"{sha256}.{extension}")
+
+    def staging_path(self, name: str, extension: str) -> str:
+        """Where an upload is written before its hash is known"""
+        return os.path.join(self.staging_dir, f"{name}.{extension}")
+
+    def put(self, staged_path: str, sha256: str, extension: str) -> str:
+        """
+        Move a staged file to its content address; identical content is kept only once.
+        When the blob already exists the staged copy is kept: call settle() once the
+        resume_files row is committed.
+        """
+        path = self.path_for(sha256, extension)
+        if os.path.exists(path):
+            print(f"♻️ Blob {sha256[:12]} already stored, reusing it")
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(staged_path, path)
+        return path
+
+    def settle(self, staged_path: str, path: str):
+        """
+        Drop the staged copy kept by put(). If a release or purge removed the reused
+        blob before this upload's reference was committed, the staged copy replaces it.
+        """
+        if not os.path.exists(staged_path):
+            return
+        if os.path.exists(path):
+            os.remove(staged_path)
+            return
+        print(f"♻️ Blob {os.path.basename(path)[:12]} was removed meanwhile, restoring it")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(staged_path, path)
+
+    def attach(self, db: Session, resume_id: str, sha256: str, extension: str, size: int, path: str) -> ResumeFile:
+        """Record which blob holds a resume's file (committed by the caller)"""
+        record = ResumeFile(
+            resume_id=resume_id,
+            sha256=sha256,
+            extension=extension,
+            media_type=MEDIA_TYPES[extension],
+            size=size,
+            path=path
+        )
+        db.add(record)
+        return record
+
+    def locate(self, db: Session, resume_id: str) -> Optional[ResumeFile]:
+        return db.get(ResumeFile, resume_id)
+
+    def adopt(self, db: Session, resume_id: str, legacy_path: str) -> ResumeFile:
+        """Move a file stored before the blob store into it and record it"""
+        digest = hashlib.sha256()
+        with open(legacy_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        extension = legacy_path.rsplit(".", 1)[-1]
+        size = os.path.getsize(legacy_path)
+        path = self.put(legacy_path, digest.hexdigest(), extension)
+        record = self.attach(db, resume_id, digest.hexdigest(), extension, size, path)
+        db.commit()
+        self.settle(legacy_path, path)
+        print(f"📦 Moved {legacy_path} into the blob store")
+        return record
+
+    @staticmethod
+    def blob_name(record: ResumeFile) -> str:
+        return f"{record.sha256}.{record.extension}"
+
+    def path_for_blob(self, blob: str) -> Optional[str]:
+        """Path for a "<sha256>.<ext>" blob name, or None if the name is malformed"""
+        sha256, _, extension = blob.partition(".")
+        if len(sha256) != 64 or not all(c in "0123456789abcdef" for c in sha256) or extension not in MEDIA_TYPES:
+            return None
+        return self.path_for(sha256, extension)
+
+    def release(self, db: Session, resume_id: str) -> bool:
+        """Detach a resume from its blob; the file is removed once nothing references it"""
+        record = db.get(ResumeFile, resume_id)
+        if record is None:
+            return False
+        sha256, path = record.sha256, record.path
+        db.delete(record)
+        db.commit()
+        return self._remove_unreferenced(db, {sha256: path}) == 1
+
+    def _remove_unreferenced(self, db: Session, paths_by_sha: Dict[str, str]) -> int:
+        """
+        Delete blob files no resume_files row references. Each file is moved aside
+        before the check, so an upload committing a reference meanwhile is either
+        seen by the check (file moved back) or finds the blob gone and restores it
+        from its staged copy (see settle).
+        """
+        aside = {}
+        for sha256, path in paths_by_sha.items():
+            moved = f"{path}.{uuid.uuid4().hex}.deleting"
+            try:
+                os.replace(path, moved)
+            except FileNotFoundError:
+                continue
+            aside[sha256] = moved
+
+        # End the session's read transaction so the check sees the latest commits
+        db.commit()
+        referenced = {
+            sha256 for (sha256,) in
+            db.query(ResumeFile.sha256).filter(ResumeFile.sha256.in_(list(aside))).distinct()
+        } if aside else set()
+
+        removed = 0
+        for sha256, moved in aside.items():
+            if sha256 in referenced:
+                os.replace(moved, paths_by_sha[sha256])
+            else:
+                os.remove(moved)
+                removed += 1
+        return removed
+
+    def purge(self, db: Session, paths_by_sha: Dict[str, str], chunk_size: int = 500) -> int:
+        """Remove blob files that no resume_files row references any more; returns files removed"""
+        removed = 0
+        candidates = list(paths_by_sha)
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            # Re-checked here: another upload may have reused the same content meanwhile
+            removed += self._remove_unreferenced(db, {sha256: paths_by_sha[sha256] for sha256 in chunk})
+        return removed
@@ -18,3 +18,10 @@ class EmbeddingService:
         """Generate embeddings for multiple texts"""
         embeddings = self.model.encode(texts)
         return embeddings.astype('float32')
+    
+    def count_tokens(self, text: str) -> int:
+        """Count tokens with the local model tokenizer (approximation if unavailable)"""
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            return max(1, len(text) // 4)
+        return len(tokenizer.tokenize(text))
@@ -0,0 +1,144 @@
+import re
+from datetime import date
+from functools import lru_cache
+from typing import List, Tuple
+from app.services.resume_parser import ResumeParser
+
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+# Real month spellings only, as whole words: "Marketing" and "Junior" are not months
+_MONTH = (
+    r'\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?'
+)
+_YEAR = r'(?:19[6-9]\d|20\d\d)'
+_DATE = rf'(?:{_MONTH}\s*,?\s*{_YEAR}|\d{{1,2}}\s*/\s*{_YEAR}|{_YEAR})'
+# Possessive forms too: "4 years' experience"
+_YEARS = r'(?:years?|yrs?)[\'’]?'
+# "N years <working> in/with" only counts with experience wording ("10 years in business" doesn't)
+_WORKING = (
+    r'(?:(?:professional|hands-on|industry|practical)\s+)?'
+    r'(?:working|work|programming|developing|coding|hands-on)'
+)
+
+# One compiled, case-insensitive pass finds stated experience and date ranges together
+EXPERIENCE_PATTERN = re.compile(
+    rf'''
+      \b(?P<stated>\d{{1,2}})\+?\s*{_YEARS}\s+(?:of\s+)?(?:[a-z/-]+\s+){{0,2}}?experience
+    | experience\s*(?:of|:)?\s*\b(?P<stated_after>\d{{1,2}})\+?\s*{_YEARS}
+    | \b(?P<required>\d{{1,2}})\+?\s*{_YEARS}\s+(?:of\s+)?{_WORKING}\s+(?:in|with)\b
+    | (?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|present|current|now|today|date)
+    ''',
+    re.IGNORECASE | re.VERBOSE
+)
+
+MAX_REASONABLE_YEARS = 50
+
+
+def _parse_date(value: str, is_end: bool) -> Tuple[int, int]:
+    """Parse a matched date into (year, month); open-ended ends mean today"""
+    value = value.lower().strip()
+    if value in ("present", "current", "now", "today", "date"):
+        today = date.today()
+        return today.year, today.month
+
+    year = int(re.search(r'\d{4}', value).group(0))
+    month_name = re.match(r'[a-z]+', value)
+    if month_name and month_name.group(0)[:3] in MONTHS:
+        return year, MONTHS[month_name.group(0)[:3]]
+    numeric = re.match(r'(\d{1,2})\s*/', value)
+    if numeric and 1 <= int(numeric.group(1)) <= 12:
+        return year, int(numeric.group(1))
+    # Year-only ranges cover the whole year at the end, from January at the start
+    return year, 12 if is_end else 1
+
+
+def _total_tenure(ranges: List[Tuple[int, int]]) -> float:
+    """Total years covered by month ranges, merging overlaps"""
+    total_months = 0
+    current_start, current_end = None, None
+    for start, end in sorted(ranges):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total_months += current_end - current_start + 1
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total_months += current_end - current_start + 1
+    return total_months / 12
+
+
+@lru_cache(maxsize=1024)
+def extract_date_ranges(text: str) -> Tuple[Tuple[str, str], ...]:
+    """Dated roles as ("YYYY-MM", "YYYY-MM" or "present") pairs, in document order"""
+    ranges = []
+    for match in EXPERIENCE_PATTERN.finditer(text):
+        if not match.group("start"):
+            continue
+        start_year, start_month = _parse_date(match.group("start"), is_end=False)
+        end_value = match.group("end").lower()
+        if end_value in ("present", "current", "now", "today", "date"):
+            end = "present"
+        else:
+            end_year, end_month = _parse_date(end_value, is_end=True)
+            end = f"{end_year:04d}-{end_month:02d}"
+        ranges.append((f"{start_year:04d}-{start_month:02d}", end))
+    return tuple(ranges)
+
+
+@lru_cache(maxsize=1024)
+def extract_experience(text: str) -> Tuple[int, float]:
+    """
+    Single pass over text returning (stated_years, tenure_years).
+    stated_years is the largest explicit "N years of experience" claim;
+    tenure_years is the merged length of all date ranges like "2019 - Present".
+    Cached so repeated matches against the same resume don't rescan it.
+    """
+    stated = 0
+    ranges = []
+    current_month = date.today().year * 12 + date.today().month
+
+    for match in EXPERIENCE_PATTERN.finditer(text):
+        number = match.group("stated") or match.group("stated_after") or match.group("required")
+        if number:
+            years = int(number)
+            if years <= MAX_REASONABLE_YEARS:
+                stated = max(stated, years)
+            continue
+
+        start_year, start_month = _parse_date(match.group("start"), is_end=False)
+        end_year, end_month = _parse_date(match.group("end"), is_end=True)
+        start = start_year * 12 + start_month
+        end = min(end_year * 12 + end_month, current_month)
+        if start <= end and end - start <= MAX_REASONABLE_YEARS * 12:
+            ranges.append((start, end))
+
+    return stated, round(_total_tenure(ranges), 1)
+
+
+@lru_cache(maxsize=1024)
+def extract_years_experience(text: str) -> int:
+    """
+    Candidate years of experience: the larger of stated years and dated tenure.
+    Tenure only counts date ranges in experience sections when the resume has
+    them, so education dates don't inflate it.
+    """
+    stated, tenure = extract_experience(text)
+    experience_text = " ".join(
+        part["text"] for part in ResumeParser.split_sections(text)
+        if part["section"] == "experience"
+    )
+    if experience_text:
+        _, tenure = extract_experience(experience_text)
+    return max(stated, int(tenure))
+
+
+def extract_required_years(text: str) -> int:
+    """Years of experience a job description asks for (date ranges ignored)"""
+    stated, _ = extract_experience(text)
+    return stated
@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import Counter
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.db_models import JobMatchDescription
+from models import JobMatchHistory, ChatHistory
+
+
+class HistoryWriter:
+    """
+    Write-behind buffer for match and chat history rows.
+    Requests hand over their row and return; a background thread inserts the
+    buffered rows in one transaction once history_batch_rows are waiting or the
+    oldest has waited history_flush_ms, so SQLite pays one commit per batch.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.batch_rows = self.settings.history_batch_rows
+        self.flush_interval = self.settings.history_flush_ms / 1000
+
+        self._matches: List[Tuple[JobMatchHistory, str]] = []
+        self._chats: List[ChatHistory] = []
+        self._pending_users: Counter = Counter()
+        self._oldest: Optional[float] = None
+        self._failures = 0
+        self._cond = threading.Condition()
+        # Held while a batch is being written, so discards and reads see a settled state
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.flushed_rows = 0
+        self.flushes = 0
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and write everything still buffered"""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def add_match(self, match: JobMatchHistory, jd_hash: str):
+        """Queue a match history row plus its link to the registered job description"""
+        with self._cond:
+            self._matches.append((match, jd_hash))
+            self._queued(match.user_id)
+        self._flush_if_stopped()
+
+    def add_chat(self, chat: ChatHistory):
+        with self._cond:
+            self._chats.append(chat)
+            self._queued(chat.user_id)
+        self._flush_if_stopped()
+
+    def _queued(self, user_id: str):
+        self._pending_users[user_id] += 1
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        self._cond.notify()
+
+    def _flush_if_stopped(self):
+        # Without the background thread (not started, or shutting down) write directly
+        if self._thread is None:
+            self.flush()
+
+    def pending(self, user_id: Optional[str] = None) -> int:
+        if user_id is not None:
+            return self._pending_users.get(user_id, 0)
+        return len(self._matches) + len(self._chats)
+
+    def _take(self) -> Tuple[List[Tuple[JobMatchHistory, str]], List[ChatHistory]]:
+        with self._cond:
+            matches, chats = self._matches, self._chats
+            self._matches, self._chats = [], []
+            # Per-user counts stay until the batch is committed (see _settled),
+            # so reads that check pending() never miss rows still being written
+            self._oldest = None
+        return matches, chats
+
+    def _settled(self, user_ids: List[str]):
+        """A taken batch was committed or dropped: its rows are no longer pending"""
+        with self._cond:
+            for user_id in user_ids:
+                self._pending_users[user_id] -= 1
+                if self._pending_users[user_id] <= 0:
+                    del self._pending_users[user_id]
+
+    def _requeue(self, matches: List[Tuple[JobMatchHistory, str]], chats: List[ChatHistory]):
+        with self._cond:
+            self._matches[:0] = matches
+            self._chats[:0] = chats
+            self._oldest = self._oldest or time.monotonic()
+
+    def flush(self) -> int:
+        """Write every buffered row now in one transaction; returns rows written"""
+        with self._flush_lock:
+            matches, chats = self._take()
+            if not matches and not chats:
+                return 0
+            # Read before the commit expires the rows' attributes
+            user_ids = [match.user_id for match, _ in matches] + [chat.user_id for chat in chats]
+
+            db = self.session_factory()
+            try:
+                match_rows = [match for match, _ in matches]
+                db.add_all(match_rows)
+                db.add_all(chats)
+                # Match ids are needed for the job description links
+                db.flush()
+                db.add_all([
+                    JobMatchDescription(match_id=match.id, jd_hash=jd_hash)
+                    for match, jd_hash in matches
+                ])
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self._failures += 1
+                if self._failures < 3:
+                    print(f"⚠️ History flush failed, will retry: {e}")
+                    # Fresh copies: the failed session may have left state on the originals
+                    self._requeue(
+                        [(self._copy(match), jd_hash) for match, jd_hash in matches],
+                        [self._copy(chat) for chat in chats]
+                    )
+                else:
+                    print(f"❌ Dropping {len(matches) + len(chats)} history rows after repeated failures: {e}")
+                    self._settled(user_ids)
+                    self._failures = 0
+                return 0
+            finally:
+                db.close()
+
+            self._settled(user_ids)
+            self._failures = 0
+            self.flushes += 1
+            self.flushed_rows += len(matches) + len(chats)
+            return len(matches) + len(chats)
+
+    @staticmethod
+    def _copy(row):
+        columns = {attr.key: getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs if attr.key != "id"}
+        return type(row)(**columns)
+
+    def discard(self, user_id: str) -> int:
+        """Drop buffered rows for a user (account deletion); waits for an in-flight batch"""
+        with self._flush_lock, self._cond:
+            before = self.pending()
+            self._matches = [(match, jd_hash) for match, jd_hash in self._matches if match.user_id != user_id]
+            self._chats = [chat for chat in self._chats if chat.user_id != user_id]
+            self._pending_users.pop(user_id, None)
+            if not self.pending():
+                self._oldest = None
+            return before - self.pending()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._cond:
+                while self._oldest is None and not self._stop.is_set():
+                    self._cond.wait()
+                while not self._stop.is_set() and self.pending() < self.batch_rows:
+                    remaining = self._oldest + self.flush_interval - time.monotonic() if self._oldest else 0
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            if not self._stop.is_set():
+                self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending(),
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "batch_rows": self.batch_rows,
+            "flush_ms": self.settings.history_flush_ms
+        }
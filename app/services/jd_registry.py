@@ -0,0 +1,120 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.db_models import JobDescription
+from app.services.embeddings import EmbeddingService
+from app.services.experience_extractor import extract_required_years
+from app.services.skill_extractor import SkillExtractor
+
+
+@dataclass(slots=True)
+class ParsedJobDescription:
+    """Everything a job match needs from a job description"""
+    jd_hash: str
+    text: str
+    job_title: str
+    skills: List[str]
+    required_years: int
+    embedding: np.ndarray
+
+
+def normalize_jd(text: str) -> str:
+    """Case/whitespace-insensitive form used for dedup"""
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def jd_hash(text: str) -> str:
+    return hashlib.sha256(normalize_jd(text).encode("utf-8")).hexdigest()
+
+
+class JDRegistry:
+    """Parses each distinct job description once; repeats are served from memory or the DB"""
+
+    def __init__(self, skill_extractor: SkillExtractor, embedding_service: EmbeddingService):
+        self.settings = get_settings()
+        self.skill_extractor = skill_extractor
+        self.embedding_service = embedding_service
+        self.max_cached = self.settings.jd_cache_size
+        self._cache: "OrderedDict[str, ParsedJobDescription]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, parsed: ParsedJobDescription):
+        with self._lock:
+            self._cache[parsed.jd_hash] = parsed
+            self._cache.move_to_end(parsed.jd_hash)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _from_row(row: JobDescription) -> ParsedJobDescription:
+        return ParsedJobDescription(
+            jd_hash=row.jd_hash,
+            text=row.text,
+            job_title=row.job_title,
+            skills=list(row.skills),
+            required_years=row.required_years,
+            embedding=np.frombuffer(row.embedding, dtype='float32')
+        )
+
+    def get(self, db: Session, key: str) -> Optional[ParsedJobDescription]:
+        """Look up a registered job description by hash"""
+        with self._lock:
+            parsed = self._cache.get(key)
+            if parsed is not None:
+                self._cache.move_to_end(key)
+                return parsed
+
+        row = db.get(JobDescription, key)
+        if row is None:
+            return None
+        parsed = self._from_row(row)
+        self._remember(parsed)
+        return parsed
+
+    def resolve(self, db: Session, text: str) -> ParsedJobDescription:
+        """Return the parsed job description, parsing and registering it on first sight"""
+        key = jd_hash(text)
+
+        parsed = self.get(db, key)
+        if parsed is not None:
+            # Read-only hit: how often a JD is used is already in job_match_descriptions
+            print(f"⚡ Job description {key[:12]} already registered")
+            return parsed
+
+        print(f"📋 Registering new job description {key[:12]}...")
+        skills = self.skill_extractor.extract_skills(text)
+        embedding = np.asarray(
+            self.embedding_service.generate_embedding(text[:4000]), dtype='float32'
+        )
+        parsed = ParsedJobDescription(
+            jd_hash=key,
+            text=text,
+            job_title=text.split('\n')[0][:100] if text else "Job Position",
+            skills=skills,
+            required_years=extract_required_years(text),
+            embedding=embedding
+        )
+
+        try:
+            db.add(JobDescription(
+                jd_hash=key,
+                job_title=parsed.job_title,
+                text=text,
+                skills=skills,
+                required_years=parsed.required_years,
+                embedding=embedding.tobytes()
+            ))
+            db.commit()
+        except IntegrityError:
+            # Registered concurrently by another request - theirs is equivalent
+            db.rollback()
+
+        self._remember(parsed)
+        return parsed
@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+from app.config import get_settings
+
+
+# Pipeline stages, in order. A job waits at a stage with status "queued"
+# until a worker for that stage claims it and sets status "running".
+STAGE_PARSE = "parse"
+STAGE_EMBED = "embed"
+STAGE_DONE = "done"
+
+
+class JobQueue:
+    """Persistent SQLite-backed queue tracking each upload through the pipeline stages"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.settings = get_settings()
+        self.db_path = db_path or self.settings.job_queue_path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS upload_jobs (
+                resume_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_upload_jobs_claim ON upload_jobs (stage, status, created_at)"
+        )
+        self._conn.commit()
+
+    def enqueue(self, resume_id: str, user_id: str, filename: str, file_path: str):
+        """Add a new upload waiting for parsing"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO upload_jobs
+                   (resume_id, user_id, filename, file_path, stage, status, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)""",
+                (resume_id, user_id, filename, file_path, STAGE_PARSE, now, now)
+            )
+            self._conn.commit()
+
+    def claim(self, stage: str) -> Optional[dict]:
+        """Atomically take the oldest queued job at a stage, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT * FROM upload_jobs WHERE stage = ? AND status = 'queued'
+                   ORDER BY created_at LIMIT 1""",
+                (stage,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            # Conditional update so competing API processes can't claim the same job
+            cursor = self._conn.execute(
+                """UPDATE upload_jobs SET status = 'running', attempts = attempts + 1, updated_at = ?
+                   WHERE resume_id = ? AND status = 'queued'""",
+                (time.time(), row["resume_id"])
+            )
+            self._conn.commit()
+            return dict(row) if cursor.rowcount == 1 else None
+
+    def advance(self, resume_id: str, next_stage: str):
+        """Move a job to the next stage (queued there, or finished)"""
+        status = "done" if next_stage == STAGE_DONE else "queued"
+        with self._lock:
+            self._conn.execute(
+                "UPDATE upload_jobs SET stage = ?, status = ?, error = NULL, updated_at = ? WHERE resume_id = ?",
+                (next_stage, status, time.time(), resume_id)
+            )
+            self._conn.commit()
+
+    def requeue(self, resume_id: str):
+        """Put a running job back in the queue at its current stage"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE upload_jobs SET status = 'queued', updated_at = ? WHERE resume_id = ? AND status = 'running'",
+                (time.time(), resume_id)
+            )
+            self._conn.commit()
+
+    def fail(self, resume_id: str, error: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE upload_jobs SET status = 'failed', error = ?, updated_at = ? WHERE resume_id = ?",
+                (error[:1000], time.time(), resume_id)
+            )
+            self._conn.commit()
+
+    def get(self, resume_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM upload_jobs WHERE resume_id = ?", (resume_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def pending_count(self) -> int:
+        """Jobs not yet finished or failed (used for backpressure)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM upload_jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+
+    def requeue_running(self):
+        """After a restart, jobs left running by the old process go back in the queue"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE upload_jobs SET status = 'queued', updated_at = ? WHERE status = 'running'",
+                (time.time(),)
+            )
+            self._conn.commit()
+
+    def delete(self, resume_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM upload_jobs WHERE resume_id = ?", (resume_id,))
+            self._conn.commit()
+
+    def delete_many(self, resume_ids: List[str]):
+        """Remove many jobs in one transaction"""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM upload_jobs WHERE resume_id = ?", [(resume_id,) for resume_id in resume_ids]
+            )
+            self._conn.commit()
@@ -0,0 +1,213 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+import httpx
+from groq import (
+    Groq,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError
+)
+from app.config import get_settings
+from app.services.llm_cache import prompt_hash
+
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when the LLM provider cannot be reached (circuit open or retries exhausted)"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests to the provider quota"""
+
+    def __init__(self, rate_per_minute: float, capacity: int):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+        self.updated_at = now
+
+    def acquire(self, timeout: float) -> bool:
+        """Take one token, waiting up to timeout seconds for a refill"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate_per_second
+
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Stops calling the provider after repeated failures, then probes again after a cool-down"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            return self.state != "open"
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.state == "half-open":
+                self.opened_at = time.monotonic()
+
+
+class LLMGateway:
+    """Pooled, rate-limited, retrying wrapper around the Groq chat API"""
+
+    def __init__(self):
+        self.settings = get_settings()
+
+        # Persistent keep-alive connections; retries are handled here, not by the SDK
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=self.settings.llm_max_concurrency,
+                max_keepalive_connections=self.settings.llm_max_concurrency
+            ),
+            timeout=httpx.Timeout(self.settings.llm_timeout_seconds, connect=5.0)
+        )
+        self.client = Groq(
+            api_key=self.settings.groq_api_key,
+            base_url=self.settings.groq_base_url,
+            http_client=self.http_client,
+            max_retries=0
+        )
+
+        self.semaphore = threading.BoundedSemaphore(self.settings.llm_max_concurrency)
+        self.rate_limiter = TokenBucket(
+            rate_per_minute=self.settings.llm_requests_per_minute,
+            capacity=self.settings.llm_burst_size
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=self.settings.llm_circuit_failure_threshold,
+            reset_timeout=self.settings.llm_circuit_reset_seconds
+        )
+
+        # Single-flight: identical concurrent prompts share one in-flight request
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self.coalesced = 0
+
+    def complete(self, messages: List[dict], max_tokens: int, temperature: float) -> str:
+        """Run a chat completion, sharing the result with identical in-flight calls"""
+        key = f"{prompt_hash(self.settings.llm_model, messages, temperature)}:{max_tokens}"
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            print("🔗 Coalesced duplicate LLM request onto in-flight call")
+            return future.result()
+
+        try:
+            result = self._complete_uncoalesced(messages, max_tokens, temperature)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+
+    def _complete_uncoalesced(self, messages: List[dict], max_tokens: int, temperature: float) -> str:
+        """Rate-limited, retried call to the provider"""
+        if not self.circuit_breaker.allow_request():
+            raise LLMUnavailableError("LLM circuit breaker is open")
+
+        last_error = None
+        for attempt in range(self.settings.llm_max_retries + 1):
+            if not self.rate_limiter.acquire(timeout=self.settings.llm_timeout_seconds):
+                raise LLMUnavailableError("Timed out waiting for LLM rate limit")
+
+            try:
+                with self.semaphore:
+                    response = self.client.chat.completions.create(
+                        model=self.settings.llm_model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                self.circuit_breaker.record_success()
+                return response.choices[0].message.content
+            except RETRYABLE_ERRORS as e:
+                last_error = e
+                if attempt == self.settings.llm_max_retries:
+                    break
+                delay = self._backoff_delay(attempt, e)
+                print(f"⚠️ LLM call failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+        # One failure per call, however many attempts it took
+        self.circuit_breaker.record_failure()
+        raise LLMUnavailableError(f"LLM request failed: {last_error}")
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After on 429s"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.settings.llm_backoff_max_seconds)
+            except ValueError:
+                pass
+
+        ceiling = min(
+            self.settings.llm_backoff_max_seconds,
+            self.settings.llm_backoff_base_seconds * (2 ** attempt)
+        )
+        return random.uniform(0, ceiling)
+
+    def stats(self) -> dict:
+        """Gateway health for monitoring"""
+        return {
+            "circuit": self.circuit_breaker.state,
+            "consecutive_failures": self.circuit_breaker.failures,
+            "rate_limit_tokens": round(self.rate_limiter.tokens, 2),
+            "in_flight": len(self._in_flight),
+            "coalesced_requests": self.coalesced
+        }
+
+    def close(self):
+        self.http_client.close()
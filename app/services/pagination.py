@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just after a (created_at, id) position"""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def select_fields(fields: Optional[str], columns: Dict[str, Any], presets: Dict[str, List[str]]) -> List[str]:
+    """
+    Field names to return for ?fields=a,b or a preset name like "summary".
+    id and created_at are always included because cursors are built from them.
+    """
+    if not fields:
+        return list(columns)
+    names = presets.get(fields) or [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ["id", "created_at"] + [name for name in names if name not in ("id", "created_at")]
+
+
+async def keyset_page(
+    db: AsyncSession, query: Select, created_column, id_column, cursor: Optional[str], limit: int
+) -> Tuple[list, Optional[str]]:
+    """
+    Newest-first page of rows after the cursor. Seeks on (created_at, id)
+    instead of OFFSET, so every page costs the same however deep it is.
+    Rows must expose created_at and id attributes.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(or_(
+            created_column < created_at,
+            and_(created_column == created_at, id_column < row_id)
+        ))
+
+    result = await db.execute(query.order_by(created_column.desc(), id_column.desc()).limit(limit + 1))
+    rows = result.all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created_at, last.id)
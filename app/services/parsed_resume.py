@@ -0,0 +1,106 @@
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+from app.config import get_settings
+from app.services.embeddings import EmbeddingService
+from app.services.experience_extractor import extract_date_ranges, extract_years_experience
+from app.services.resume_parser import ResumeParser
+from app.services.skill_extractor import SkillExtractor
+
+
+@dataclass(slots=True)
+class DatedRole:
+    section: str
+    start: str          # "YYYY-MM"
+    end: str            # "YYYY-MM" or "present"
+
+
+@dataclass(slots=True)
+class ParsedResume:
+    """Everything derived from a resume's text, computed once at upload"""
+    resume_id: str
+    text: str
+    sections: List[Dict[str, str]]
+    roles: List[DatedRole]
+    total_years: int
+    skills: List[str]
+    domains: List[str]
+    contact: Dict[str, Optional[str]]
+    embedding: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ParsedResume":
+        data = dict(data)
+        data["roles"] = [DatedRole(**role) for role in data.get("roles", [])]
+        return cls(**data)
+
+    @staticmethod
+    def path_for(resume_id: str) -> str:
+        """Where the parsed form is serialized, sharded by id prefix"""
+        return os.path.join(get_settings().upload_dir, "parsed", resume_id[:2], f"{resume_id}.parsed.json")
+
+    @staticmethod
+    def legacy_path_for(resume_id: str) -> str:
+        """Flat location used before parsed forms were sharded"""
+        return os.path.join(get_settings().upload_dir, f"{resume_id}.parsed.json")
+
+    def save(self, path: str = None):
+        path = path or self.path_for(self.resume_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, resume_id: str, path: str = None) -> Optional["ParsedResume"]:
+        candidates = [path] if path else [cls.path_for(resume_id), cls.legacy_path_for(resume_id)]
+        for candidate in candidates:
+            if os.path.exists(candidate):
+                with open(candidate, "r", encoding="utf-8") as f:
+                    return cls.from_dict(json.load(f))
+        return None
+
+    @classmethod
+    def delete(cls, resume_id: str):
+        for path in (cls.path_for(resume_id), cls.legacy_path_for(resume_id)):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def build_parsed_resume(
+    resume_id: str,
+    text: str,
+    skill_extractor: SkillExtractor,
+    embedding_service: Optional[EmbeddingService] = None,
+    chunk_chars: int = None
+) -> ParsedResume:
+    """Run every text-derived step once and collect the results"""
+    settings = get_settings()
+    sections = ResumeParser.chunk_sections(text, chunk_chars or settings.resume_chunk_chars)
+
+    roles = []
+    for part in ResumeParser.split_sections(text):
+        for start, end in extract_date_ranges(part["text"]):
+            roles.append(DatedRole(section=part["section"], start=start, end=end))
+
+    skills = skill_extractor.extract_skills(text)
+    domains = skill_extractor.identify_domains(skills)
+
+    embedding = []
+    if embedding_service is not None:
+        embedding = embedding_service.generate_embedding(text[:5000])
+
+    return ParsedResume(
+        resume_id=resume_id,
+        text=text,
+        sections=sections,
+        roles=roles,
+        total_years=extract_years_experience(text),
+        skills=skills,
+        domains=domains,
+        contact=ResumeParser.extract_contact_info(text),
+        embedding=embedding
+    )
@@ -0,0 +1,101 @@
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+
+# Split cleaned (whitespace-collapsed) text at sentence ends and bullet markers
+SEGMENT_SPLIT_PATTERN = re.compile(r'(?<=[.!?;])\s+|\s+(?=[•▪●◦]\s)|\s+\|\s+')
+WORD_PATTERN = re.compile(r'[a-z0-9+#.]+')
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from", "have",
+    "how", "i", "in", "is", "it", "my", "of", "on", "or", "should", "the", "to", "what",
+    "with", "you", "your", "we", "will", "our", "this", "that", "into", "about", "me"
+}
+
+
+class PromptBuilder:
+    """Packs the most relevant, de-duplicated text segments into a token budget"""
+
+    def __init__(self, count_tokens: Callable[[str], int], max_segment_chars: int = 400):
+        self.count_tokens = count_tokens
+        self.max_segment_chars = max_segment_chars
+
+    def split_segments(self, text: str) -> List[str]:
+        """Break text into sentence/bullet sized segments"""
+        segments = []
+        for piece in SEGMENT_SPLIT_PATTERN.split(text or ""):
+            piece = piece.strip()
+            while len(piece) > self.max_segment_chars:
+                cut = piece.rfind(" ", 0, self.max_segment_chars)
+                cut = cut if cut > 0 else self.max_segment_chars
+                segments.append(piece[:cut].strip())
+                piece = piece[cut:].strip()
+            if piece:
+                segments.append(piece)
+        return segments
+
+    @staticmethod
+    def keywords(text: str) -> Set[str]:
+        """Lower-cased content words used for relevance scoring"""
+        return {w.strip(".") for w in WORD_PATTERN.findall(text.lower())} - STOPWORDS - {""}
+
+    def pack(
+        self,
+        segments: Iterable[str],
+        budget: int,
+        relevance_terms: Set[str],
+        seen: Optional[Set[str]] = None
+    ) -> Tuple[str, int]:
+        """
+        Greedily select the highest-scoring unique segments that fit the budget.
+        Selected segments are emitted in their original order for readability.
+        Returns the packed text and its token count.
+        """
+        seen = seen if seen is not None else set()
+        candidates = []
+        for position, segment in enumerate(segments):
+            words = self.keywords(segment)
+            # Sorted, so the same words give the same key whatever the set's order
+            key = " ".join(sorted(words)) or segment.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            overlap = len(words & relevance_terms)
+            candidates.append((overlap, -position, position, segment, key))
+
+        # Most relevant first; earlier segments win ties (headline info tends to lead)
+        candidates.sort(reverse=True)
+
+        chosen = []
+        used = 0
+        for _, _, position, segment, key in candidates:
+            cost = self.count_tokens(segment) + 1
+            if used + cost > budget:
+                seen.discard(key)
+                continue
+            chosen.append((position, segment))
+            used += cost
+
+        chosen.sort()
+        return " ".join(segment for _, segment in chosen), used
+
+    def build_sections(
+        self,
+        sections: List[Tuple[str, Union[str, List[str]], int]],
+        relevance_terms: Set[str]
+    ) -> Dict[str, str]:
+        """
+        Pack several named sections, each with its own token budget.
+        A section source is a text or a list of texts (e.g. retrieved chunks).
+        A segment used in one section is never repeated in a later one.
+        """
+        seen: Set[str] = set()
+        packed = {}
+        total = 0
+        for name, source, budget in sections:
+            texts = [source] if isinstance(source, str) else source
+            segments = [segment for text in texts for segment in self.split_segments(text)]
+            packed[name], used = self.pack(segments, budget, relevance_terms, seen)
+            total += used
+        print(f"🧮 Packed prompt sections into {total} tokens")
+        return packed
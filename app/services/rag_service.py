@@ -1,46 +1,140 @@
-from groq import Groq
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set
 import numpy as np
 import re
 from app.config import get_settings
 from app.services.embeddings import EmbeddingService
 from app.services.vector_store import VectorStore
+from app.services.parsed_resume import ParsedResume
 from app.services.skill_extractor import SkillExtractor
+from app.services.llm_gateway import LLMGateway
+from app.services.llm_cache import LLMResponseCache, prompt_hash
+from app.services.semantic_cache import SemanticCache
+from app.services.prompt_builder import PromptBuilder
+from app.services.skill_ontology import SkillOntology
+from app.services.jd_registry import ParsedJobDescription
 from app.prompts import CAREER_ADVICE_PROMPT, JOB_MATCH_PROMPT
 
 
 class RAGService:
-    def __init__(self):
+    def __init__(self, embedding_service: EmbeddingService = None, vector_store: VectorStore = None):
         self.settings = get_settings()
         if self.settings.groq_api_key:
-            self.client = Groq(api_key=self.settings.groq_api_key)
+            self.llm = LLMGateway()
         
         else:
             raise ValueError("API Key not found. Please set GROQ_API_KEY in .env")
         
-        self.embedding_service = EmbeddingService()
-        self.vector_store = VectorStore()
-        self.vector_store.load()
+        # Share the app's embedding model and vector store when provided
+        self.embedding_service = embedding_service or EmbeddingService()
+        if vector_store is None:
+            vector_store = VectorStore()
+            vector_store.load()
+        self.vector_store = vector_store
         self.skill_extractor = SkillExtractor()
+        self.llm_cache = LLMResponseCache() if self.settings.llm_cache_enabled else None
+        self.semantic_cache = (
+            SemanticCache(self.embedding_service) if self.settings.semantic_cache_enabled else None
+        )
+        self.prompt_builder = PromptBuilder(self.embedding_service.count_tokens)
+        self.skill_ontology = SkillOntology(self.skill_extractor, self.embedding_service)
+    
+    def index_resume_sections(
+        self,
+        resume_id: str,
+        user_id: str,
+        chunks: List[Dict[str, str]],
+        embeddings: Optional[np.ndarray] = None,
+        skip_if_indexed: bool = False
+    ) -> int:
+        """
+        Store resume section chunks tagged with resume_id, embedding them unless
+        the caller already did. Call without holding the store lock when embeddings
+        are not given: only the check and add take it.
+        """
+        if not chunks:
+            return 0
+        
+        if embeddings is None:
+            embeddings = self.embedding_service.generate_embeddings_batch([c["text"] for c in chunks])
+        with self.vector_store.lock:
+            if skip_if_indexed and self.vector_store.has_documents(resume_id, "resume_section"):
+                return 0
+            self.vector_store.add_documents(
+                embeddings=embeddings,
+                documents=[c["text"] for c in chunks],
+                metadata=[
+                    {"resume_id": resume_id, "user_id": user_id, "type": "resume_section", "section": c["section"]}
+                    for c in chunks
+                ]
+            )
+        print(f"🧩 Indexed {len(chunks)} resume chunks for {resume_id}")
+        return len(chunks)
+    
+    def retrieve_resume_chunks(
+        self, resume: ParsedResume, query_embedding: np.ndarray, user_id: str = None
+    ) -> List[str]:
+        """Top-k chunks of THIS resume most relevant to the query"""
+        if not self.vector_store.has_documents(resume.resume_id, "resume_section"):
+            # Resume uploaded before chunk indexing existed - index it now
+            # (a concurrent request may get there first; only one adds the chunks)
+            if self.index_resume_sections(resume.resume_id, user_id, resume.sections, skip_if_indexed=True):
+                self.vector_store.save()
+        
+        results = self.vector_store.search_resume(
+            query_embedding, resume.resume_id, "resume_section", k=self.settings.career_advice_top_k
+        )
+        return [document for document, _, _ in results]
     
-    def get_career_advice(self, query: str, resume_text: str, resume_id: str = None) -> tuple[str, List[str]]:
+    def get_career_advice(
+        self, query: str, resume: ParsedResume, user_id: str = None
+    ) -> tuple[str, List[str]]:
         """
-        Get career advice using ONLY the provided resume (not vector search)
-        This ensures advice is based on the CURRENT USER'S resume only
+        Get career advice using ONLY the provided resume.
+        Retrieval is restricted to chunks of this resume_id, so advice is
+        never based on other users' resumes.
         """
         
+        resume_id = resume.resume_id
+        resume_text = resume.text
+        
         print(f"💬 Generating career advice for query: {query[:100]}...")
         print(f"📄 Using resume (first 200 chars): {resume_text[:200]}...")
         
-        # ✅ Don't use vector search - use the resume_text directly
-        # This prevents getting advice based on other users' resumes
-        
-        # Build prompt with ONLY current user's resume
-        context = f"Candidate's Resume:\n{resume_text[:2000]}"
+        query_embedding = np.asarray(self.embedding_service.generate_embedding(query), dtype='float32')
+        
+        # Reuse a previous answer for a near-duplicate question on the same resume
+        query_vector = None
+        if self.semantic_cache and resume_id:
+            fingerprint = self.semantic_cache.fingerprint(resume_text)
+            query_vector = self.semantic_cache.normalize(query_embedding)
+            cached = self.semantic_cache.lookup(resume_id, fingerprint, query_vector)
+            if cached is not None:
+                # Same context the answer was generated from
+                return cached
+        
+        # Retrieve the sections of the current user's resume relevant to the question
+        chunks = []
+        if resume_id:
+            chunks = self.retrieve_resume_chunks(resume, query_embedding, user_id)
+        
+        # Pack retrieved chunks into the context and fill the summary with the rest
+        # of the resume, within the token budget and without repeating segments
+        # (section headings are stripped so the same sentence dedupes across sections)
+        resume_parts = [chunk["text"] for chunk in resume.sections] or [resume_text]
+        budget = self.settings.career_advice_token_budget
+        sections = self.prompt_builder.build_sections(
+            [
+                ("context", chunks or resume_parts, int(budget * 0.6)),
+                ("resume", resume_parts, budget - int(budget * 0.6))
+            ],
+            relevance_terms=self.prompt_builder.keywords(query)
+        )
+        context = f"Candidate's Resume:\n{sections['context']}"
+        relevant_context = chunks or [sections["context"][:500]]
         
         prompt = CAREER_ADVICE_PROMPT.format(
             context=context,
-            resume=resume_text[:2000],
+            resume=sections["resume"],
             query=query
         )
         
@@ -59,8 +153,7 @@ Be specific, encouraging, and practical."""
         
         try:
             # Call LLM with explicit system message
-            response = self.client.chat.completions.create(
-                model=self.settings.llm_model,
+            answer = self.llm.complete(
                 messages=[
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": prompt}
@@ -69,17 +162,18 @@ Be specific, encouraging, and practical."""
                 temperature=0.7  # Slightly higher for more personalized responses
             )
             
-            answer = response.choices[0].message.content
-            
             print(f"✅ Generated career advice ({len(answer)} chars)")
             
-            # Return answer and resume snippet as context
-            return answer, [resume_text[:500]]
+            if query_vector is not None:
+                self.semantic_cache.store(resume_id, fingerprint, query, query_vector, answer, relevant_context)
+            
+            # Return answer and the resume excerpts used as context
+            return answer, relevant_context
             
         except Exception as e:
             print(f"❌ Error generating career advice: {e}")
             # Fallback response
-            return self._fallback_career_advice(query, resume_text), [resume_text[:500]]
+            return self._fallback_career_advice(query, resume_text), relevant_context
     
     def _fallback_career_advice(self, query: str, resume_text: str) -> str:
         """Fallback career advice if LLM fails"""
@@ -97,19 +191,21 @@ Based on your background, here are some general recommendations:
 
 Please try asking your question again for more personalized advice."""
     
-    def analyze_job_match(self, resume_text: str, job_description: str, resume_skills: List[str]) -> dict:
+    def analyze_job_match(self, resume: ParsedResume, job: ParsedJobDescription) -> dict:
         """
         IMPROVED: Hybrid job matching using BOTH algorithmic analysis AND LLM insights
+        Resume and job description data (skills, embeddings, experience) come precomputed
         """
+        resume_text = resume.text
+        job_description = job.text
         print("\n🔍 Starting detailed job match analysis...")
         
-        # ========== STEP 1: Extract skills from job description ==========
-        print("📋 Extracting required skills from job description...")
-        job_skills = self.skill_extractor.extract_skills(job_description)
-        print(f"   Found {len(job_skills)} required skills")
+        # ========== STEP 1: Skills required by the job description ==========
+        job_skills = job.skills
+        print(f"📋 Job description requires {len(job_skills)} skills")
         
         # ========== STEP 2: Normalize skills (handle synonyms) ==========
-        resume_skills_normalized = self._normalize_skills(resume_skills)
+        resume_skills_normalized = self._normalize_skills(resume.skills)
         job_skills_normalized = self._normalize_skills(job_skills)
         
         print(f"📊 Resume skills (normalized): {len(resume_skills_normalized)}")
@@ -119,12 +215,19 @@ Please try asking your question again for more personalized advice."""
         matched_skills = list(resume_skills_normalized & job_skills_normalized)
         missing_skills = list(job_skills_normalized - resume_skills_normalized)
         
+        # Partial credit for related skills (graph edges + skill embedding similarity)
+        partial = self.skill_ontology.partial_matches(resume_skills_normalized, missing_skills)
+        partial_credit = sum(credit for _, credit in partial.values())
+        partial_matches = [f"{job_skill} (via {resume_skill})" for job_skill, (resume_skill, _) in partial.items()]
+        missing_skills = [skill for skill in missing_skills if skill not in partial]
+        
         print(f"✅ Matched skills: {len(matched_skills)}")
+        print(f"≈ Partially matched skills: {len(partial_matches)} (credit {partial_credit:.2f})")
         print(f"❌ Missing skills: {len(missing_skills)}")
         
         # ========== STEP 4: Calculate base match score ==========
         if len(job_skills_normalized) > 0:
-            exact_match_score = (len(matched_skills) / len(job_skills_normalized)) * 100
+            exact_match_score = ((len(matched_skills) + partial_credit) / len(job_skills_normalized)) * 100
         else:
             exact_match_score = 50.0  # Default if no skills found in JD
         
@@ -132,8 +235,8 @@ Please try asking your question again for more personalized advice."""
         
         # ========== STEP 5: Semantic similarity using embeddings ==========
         print("🧠 Calculating semantic similarity...")
-        resume_embedding = self.embedding_service.generate_embedding(resume_text[:4000])
-        job_embedding = self.embedding_service.generate_embedding(job_description[:4000])
+        resume_embedding = resume.embedding or self.embedding_service.generate_embedding(resume_text[:5000])
+        job_embedding = job.embedding
         
         # Cosine similarity
         resume_vec = np.array(resume_embedding)
@@ -145,8 +248,8 @@ Please try asking your question again for more personalized advice."""
         print(f"🧬 Semantic similarity score: {semantic_score:.1f}%")
         
         # ========== STEP 6: Extract experience years ==========
-        resume_years = self._extract_years_experience(resume_text)
-        required_years = self._extract_years_experience(job_description)
+        resume_years = resume.total_years
+        required_years = job.required_years
         
         experience_score = 100.0
         if required_years > 0:
@@ -183,69 +286,30 @@ Please try asking your question again for more personalized advice."""
             "match_score": round(final_score, 1),
             "matched_skills": matched_skills[:15],  # Top 15
             "missing_skills": missing_skills[:15],  # Top 15
+            "partial_matches": partial_matches[:15],
             "recommendations": recommendations
         }
     
     def _normalize_skills(self, skills: List[str]) -> Set[str]:
         """Normalize skills to handle synonyms and variations"""
-        synonyms = {
-            'javascript': ['js', 'javascript', 'ecmascript'],
-            'python': ['python', 'python3', 'py'],
-            'react': ['react', 'reactjs', 'react.js'],
-            'node': ['node', 'nodejs', 'node.js'],
-            'machine learning': ['ml', 'machine learning', 'machinelearning'],
-            'artificial intelligence': ['ai', 'artificial intelligence'],
-            'docker': ['docker', 'containerization'],
-            'kubernetes': ['k8s', 'kubernetes'],
-            'aws': ['aws', 'amazon web services'],
-            'gcp': ['gcp', 'google cloud', 'google cloud platform'],
-            'azure': ['azure', 'microsoft azure'],
-            'typescript': ['ts', 'typescript'],
-            'java': ['java', 'java8', 'java11'],
-            'cpp': ['c++', 'cpp', 'cplusplus'],
-            'csharp': ['c#', 'csharp', 'dotnet'],
-            'sql': ['sql', 'mysql', 'postgresql', 'tsql'],
-            'nosql': ['nosql', 'mongodb', 'cassandra', 'dynamodb'],
-            'api': ['api', 'rest', 'restful', 'rest api'],
-            'frontend': ['frontend', 'front-end', 'front end'],
-            'backend': ['backend', 'back-end', 'back end'],
-        }
-        
-        normalized = set()
-        for skill in skills:
-            skill_lower = skill.lower().strip()
-            
-            # Find canonical name
-            canonical = skill_lower
-            for key, variants in synonyms.items():
-                if skill_lower in variants:
-                    canonical = key
-                    break
-            
-            normalized.add(canonical)
-        
-        return normalized
-    
-    def _extract_years_experience(self, text: str) -> int:
-        """Extract years of experience from text"""
-        patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?experience',
-            r'experience[:\s]+(\d+)\+?\s*(?:years?|yrs?)',
-            r'(\d+)\+?\s*(?:years?|yrs?)',
-        ]
-        
-        years = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(m) for m in matches])
-        
-        return max(years) if years else 0
+        return self.skill_extractor.normalize(skills)
     
     def _generate_recommendations_with_llm(
         self, resume: str, job_desc: str, matched: List[str], missing: List[str], score: float
     ) -> str:
         """Use LLM ONLY for generating recommendations, not the score"""
         
+        # Pack the parts of each document that talk about the skills in play
+        skill_terms = self.prompt_builder.keywords(" ".join(matched + missing))
+        budget = self.settings.job_match_token_budget
+        sections = self.prompt_builder.build_sections(
+            [
+                ("job_desc", job_desc, budget // 2),
+                ("resume", resume, budget - budget // 2)
+            ],
+            relevance_terms=skill_terms | self.prompt_builder.keywords(job_desc)
+        )
+        
         prompt = f"""You are a career advisor. Analyze this job match and provide actionable recommendations.
 
 MATCH SCORE: {score:.1f}%
@@ -255,10 +319,10 @@ MATCHED SKILLS: {', '.join(matched) if matched else 'None'}
 MISSING SKILLS: {', '.join(missing) if missing else 'None'}
 
 JOB DESCRIPTION (excerpt):
-{job_desc[:1500]}
+{sections["job_desc"]}
 
 RESUME (excerpt):
-{resume[:1500]}
+{sections["resume"]}
 
 Provide 3-5 specific, actionable recommendations to improve the candidate's chances. Focus on:
 1. Which missing skills to prioritize learning
@@ -268,14 +332,27 @@ Provide 3-5 specific, actionable recommendations to improve the candidate's chan
 
 Keep recommendations concise and practical. Maximum 150 words."""
 
+        messages = [{"role": "user", "content": prompt}]
+        temperature = 0.3
+        cache_key = prompt_hash(self.settings.llm_model, messages, temperature)
+        
+        if self.llm_cache:
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                print("⚡ Recommendations served from LLM cache")
+                return cached
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.settings.llm_model,
-                messages=[{"role": "user", "content": prompt}],
+            recommendations = self.llm.complete(
+                messages=messages,
                 max_tokens=300,
-                temperature=0.3
-            )
-            return response.choices[0].message.content.strip()
+                temperature=temperature
+            ).strip()
+            
+            if self.llm_cache:
+                self.llm_cache.set(cache_key, recommendations)
+            
+            return recommendations
         except Exception as e:
             print(f"⚠️ LLM recommendation failed: {e}")
             return self._fallback_recommendations(matched, missing, score)
@@ -1,8 +1,42 @@
 import pdfplumber
 from docx import Document
-from typing import Optional
+from io import BytesIO
+from typing import Dict, List, Optional
 import re
 
+
+# Section headings as they typically appear in resumes (upper or title case, optional colon)
+SECTION_HEADINGS = {
+    "experience": [
+        "Work Experience", "Professional Experience", "Employment History",
+        "Work History", "Experience", "Internships"
+    ],
+    "education": ["Education", "Academic Background", "Qualifications"],
+    "projects": ["Academic Projects", "Personal Projects", "Projects"],
+    "skills": ["Technical Skills", "Core Competencies", "Skills"],
+    "certifications": ["Certifications", "Certificates", "Achievements", "Awards"],
+    "summary": ["Professional Summary", "Career Objective", "Summary", "Objective", "Profile"],
+}
+
+def _alternatives(variants) -> str:
+    return '|'.join(re.escape(h) for h in sorted(variants, key=len, reverse=True))
+
+
+# Title-case headings only count on a line of their own (or ending in a colon), so
+# "3 years of Experience building APIs" stays one sentence; upper-case ones count
+# anywhere, which also covers text stored before line breaks were kept
+SECTION_PATTERN = re.compile(
+    r'^[ \t]*(' + _alternatives(h for headings in SECTION_HEADINGS.values() for h in headings) + r')[ \t]*(?::|$)'
+    r'|(?<![\w])(' + _alternatives(h.upper() for headings in SECTION_HEADINGS.values() for h in headings) + r')(?![\w])\s*:?',
+    re.MULTILINE
+)
+SECTION_BY_HEADING = {
+    heading.lower(): section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+
 class ResumeParser:
     @staticmethod
     def extract_text_from_pdf(file_path: str) -> str:
@@ -10,7 +44,7 @@ class ResumeParser:
         text = ""
         with pdfplumber.open(file_path) as pdf:
             for page in pdf.pages:
-                text += page.extract_text() or ""
+                text += (page.extract_text() or "") + "\n"
         return ResumeParser._clean_text(text)
     
     @staticmethod
@@ -20,10 +54,24 @@ class ResumeParser:
         text = "\n".join([para.text for para in doc.paragraphs])
         return ResumeParser._clean_text(text)
     
+    @staticmethod
+    def extract_text_from_bytes(data: bytes, extension: str) -> str:
+        """Extract text from an in-memory PDF or DOCX without touching disk"""
+        if extension == "pdf":
+            text = ""
+            with pdfplumber.open(BytesIO(data)) as pdf:
+                for page in pdf.pages:
+                    text += (page.extract_text() or "") + "\n"
+        else:
+            doc = Document(BytesIO(data))
+            text = "\n".join([para.text for para in doc.paragraphs])
+        return ResumeParser._clean_text(text)
+    
     @staticmethod
     def _clean_text(text: str) -> str:
-        """Clean extracted text"""
-        text = re.sub(r'\s+', ' ', text)
+        """Clean extracted text: collapse spaces and blank lines, keep line breaks for headings"""
+        text = re.sub(r'[^\S\n]+', ' ', text)
+        text = re.sub(r' ?\n\s*', '\n', text)
         text = text.strip()
         return text
     
@@ -40,3 +88,40 @@ class ResumeParser:
             "email": email.group(0) if email else None,
             "phone": phone.group(0) if phone else None
         }
+    
+    @staticmethod
+    def split_sections(text: str) -> List[Dict[str, str]]:
+        """Split resume text into (section, text) parts using common headings"""
+        sections = []
+        current = "summary"
+        start = 0
+        
+        for match in SECTION_PATTERN.finditer(text):
+            body = text[start:match.start()].strip()
+            if re.search(r'\w', body):
+                sections.append({"section": current, "text": body})
+            current = SECTION_BY_HEADING[(match.group(1) or match.group(2)).lower()]
+            start = match.end()
+        
+        body = text[start:].strip()
+        if re.search(r'\w', body):
+            sections.append({"section": current, "text": body})
+        return sections
+    
+    @staticmethod
+    def chunk_sections(text: str, max_chars: int = 600) -> List[Dict[str, str]]:
+        """Split each section into chunks of at most max_chars, breaking at sentences"""
+        chunks = []
+        for part in ResumeParser.split_sections(text):
+            current = ""
+            for sentence in re.split(r'(?<=[.!?;•])\s+', part["text"]):
+                if current and len(current) + len(sentence) + 1 > max_chars:
+                    chunks.append({"section": part["section"], "text": current})
+                    current = ""
+                while len(sentence) > max_chars:
+                    chunks.append({"section": part["section"], "text": sentence[:max_chars]})
+                    sentence = sentence[max_chars:]
+                current = f"{current} {sentence}".strip()
+            if current:
+                chunks.append({"section": part["section"], "text": current})
+        return chunks
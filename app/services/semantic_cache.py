@@ -0,0 +1,122 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import numpy as np
+from app.config import get_settings
+from app.services.embeddings import EmbeddingService
+
+
+class _ResumeEntries:
+    """Query vectors and answers cached for a single resume"""
+
+    def __init__(self, fingerprint: str, dimension: int):
+        self.fingerprint = fingerprint
+        self.vectors = np.empty((0, dimension), dtype='float32')
+        self.queries: List[str] = []
+        self.answers: List[str] = []
+        # Resume excerpts each answer was based on, returned with it on a hit
+        self.contexts: List[List[str]] = []
+
+
+class SemanticCache:
+    """
+    Per-resume cache that reuses answers for near-duplicate questions.
+    Bounded per resume and in the number of resumes (least recently used go first).
+    """
+
+    def __init__(self, embedding_service: EmbeddingService):
+        self.settings = get_settings()
+        self.embedding_service = embedding_service
+        self.threshold = self.settings.semantic_cache_threshold
+        self.max_entries = self.settings.semantic_cache_max_per_resume
+        self.max_resumes = self.settings.semantic_cache_max_resumes
+        self.dimension = self.settings.vector_dimension
+
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _ResumeEntries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(resume_text: str) -> str:
+        """Hash of the resume text; a change invalidates cached answers"""
+        return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def normalize(vector: np.ndarray) -> np.ndarray:
+        """Unit-normalize so dot product == cosine"""
+        vector = np.asarray(vector, dtype='float32')
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Unit-normalized query embedding"""
+        return self.normalize(self.embedding_service.generate_embedding(query))
+
+    def lookup(
+        self, resume_id: str, fingerprint: str, query_vector: np.ndarray
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Return cached (answer, context) for the closest previous question above threshold"""
+        with self._lock:
+            entries = self._entries.get(resume_id)
+            if entries is not None and entries.fingerprint != fingerprint:
+                # Resume text changed - everything cached for it is stale
+                del self._entries[resume_id]
+                entries = None
+
+            if entries is None or not entries.answers:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(resume_id)
+
+            similarities = entries.vectors @ query_vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            print(f"⚡ Semantic cache hit ({similarities[best]:.3f}) for: {entries.queries[best][:80]}")
+            return entries.answers[best], list(entries.contexts[best])
+
+    def store(
+        self, resume_id: str, fingerprint: str, query: str, query_vector: np.ndarray,
+        answer: str, context: List[str]
+    ):
+        """Remember answer and its context for this resume, dropping the oldest entry when full"""
+        with self._lock:
+            entries = self._entries.get(resume_id)
+            if entries is None or entries.fingerprint != fingerprint:
+                entries = _ResumeEntries(fingerprint, self.dimension)
+                self._entries[resume_id] = entries
+            self._entries.move_to_end(resume_id)
+            while len(self._entries) > self.max_resumes:
+                self._entries.popitem(last=False)
+
+            entries.vectors = np.vstack([entries.vectors, query_vector.reshape(1, -1)])
+            entries.queries.append(query)
+            entries.answers.append(answer)
+            entries.contexts.append(list(context))
+
+            if len(entries.answers) > self.max_entries:
+                entries.vectors = entries.vectors[1:]
+                entries.queries.pop(0)
+                entries.answers.pop(0)
+                entries.contexts.pop(0)
+
+    def invalidate(self, resume_id: str):
+        """Forget every cached answer for a resume"""
+        with self._lock:
+            self._entries.pop(resume_id, None)
+
+    def stats(self) -> dict:
+        """Hit/miss metrics for monitoring"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "resumes": len(self._entries),
+            "threshold": self.threshold
+        }
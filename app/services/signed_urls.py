@@ -0,0 +1,47 @@
+import hashlib
+import hmac
+import time
+from typing import Optional
+from urllib.parse import urlencode
+from app.config import get_settings
+
+
+class ViewUrlSigner:
+    """
+    Short-lived signed links to a resume file. Everything needed to serve the
+    file (blob name, download name) is in the signed query string, so the view
+    endpoint checks an HMAC instead of decoding a JWT and querying the DB.
+    """
+
+    def __init__(self, secret: str):
+        self.settings = get_settings()
+        self.secret = secret.encode("utf-8")
+
+    def _signature(self, resume_id: str, blob: str, name: str, expires: int) -> str:
+        message = f"{resume_id}\n{blob}\n{name}\n{expires}".encode("utf-8")
+        return hmac.new(self.secret, message, hashlib.sha256).hexdigest()
+
+    def expiry(self, now: Optional[float] = None) -> int:
+        """
+        Expiry rounded up to a whole TTL window, so links issued within the same
+        window are identical and browsers can reuse their cached copy.
+        """
+        ttl = self.settings.view_url_ttl_seconds
+        now = int(now if now is not None else time.time())
+        return (now // ttl + 2) * ttl
+
+    def sign(self, resume_id: str, blob: str, name: str) -> str:
+        """Relative URL for viewing a stored blob as the given filename"""
+        expires = self.expiry()
+        query = urlencode({
+            "blob": blob,
+            "name": name,
+            "expires": expires,
+            "sig": self._signature(resume_id, blob, name, expires)
+        })
+        return f"/resume/{resume_id}/file?{query}"
+
+    def verify(self, resume_id: str, blob: str, name: str, expires: int, sig: str) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self._signature(resume_id, blob, name, expires), sig)
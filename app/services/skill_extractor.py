@@ -1,12 +1,48 @@
 import json
-from typing import List, Set
+import os
+from typing import Dict, Iterable, List, Set
 import re
 
 class SkillExtractor:
-    def __init__(self, skills_db_path: str = "data/skills_database.json"):
+    def __init__(
+        self,
+        skills_db_path: str = "data/skills_database.json",
+        synonyms_path: str = None
+    ):
         with open(skills_db_path, 'r') as f:
             self.skills_data = json.load(f)
+        
+        # Synonyms live next to the skills database
+        synonyms_path = synonyms_path or os.path.join(os.path.dirname(skills_db_path), "skill_synonyms.json")
+        with open(synonyms_path, 'r') as f:
+            self.synonyms = json.load(f)
+        
+        # Compiled once: variant -> canonical id, so normalization is a dict lookup
+        self.canonical_by_variant = self._compile_synonyms()
         self.all_skills = self._flatten_skills()
+        # Also match distinctive synonyms (k8s, postgres, reactjs); short plain words
+        # like "ts", "rest" or "node" are too ambiguous to search for in free text
+        searchable = self.all_skills | {
+            variant for variant in self.canonical_by_variant
+            if len(variant) >= 5 or not variant.isalpha()
+        }
+        self.skill_patterns = {
+            skill: re.compile(r'\b' + re.escape(skill) + r'\b')
+            for skill in searchable
+        }
+        self.domain_skills = {
+            domain: self.normalize(data.get("skills", []))
+            for domain, data in self.skills_data.items()
+        }
+    
+    def _compile_synonyms(self) -> Dict[str, str]:
+        """Build flat variant -> canonical map from synonym lists"""
+        canonical_by_variant = {}
+        for canonical, variants in self.synonyms.items():
+            canonical_by_variant[canonical] = canonical
+            for variant in variants:
+                canonical_by_variant.setdefault(variant.lower().strip(), canonical)
+        return canonical_by_variant
     
     def _flatten_skills(self) -> Set[str]:
         """Create flat set of all skills from database"""
@@ -15,26 +51,34 @@ class SkillExtractor:
             skills.update([s.lower() for s in domain_data.get("skills", [])])
         return skills
     
+    def canonicalize(self, skill: str) -> str:
+        """Map a skill name or synonym to its canonical id"""
+        skill_lower = skill.lower().strip()
+        return self.canonical_by_variant.get(skill_lower, skill_lower)
+    
+    def normalize(self, skills: Iterable[str]) -> Set[str]:
+        """Canonical ids for a collection of skills"""
+        return {self.canonicalize(skill) for skill in skills}
+    
     def extract_skills(self, text: str) -> List[str]:
-        """Extract skills using keyword matching"""
+        """Extract skills using keyword matching, returned as canonical ids"""
         text_lower = text.lower()
-        found_skills = []
+        found_skills = set()
         
-        for skill in self.all_skills:
+        for skill, pattern in self.skill_patterns.items():
             # Use word boundaries for accurate matching
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
+            if pattern.search(text_lower):
+                found_skills.add(self.canonical_by_variant.get(skill, skill))
         
-        return list(set(found_skills))
+        return list(found_skills)
     
     def identify_domains(self, skills: List[str]) -> List[str]:
         """Identify career domains based on extracted skills"""
         domain_scores = {}
+        skill_ids = self.normalize(skills)
         
-        for domain, data in self.skills_data.items():
-            domain_skills = [s.lower() for s in data.get("skills", [])]
-            overlap = len(set(skills) & set(domain_skills))
+        for domain, domain_skills in self.domain_skills.items():
+            overlap = len(skill_ids & domain_skills)
             if overlap > 0:
                 domain_scores[domain] = overlap
         
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Set, Tuple
+import numpy as np
+from app.config import get_settings
+from app.services.embeddings import EmbeddingService
+from app.services.skill_extractor import SkillExtractor
+
+
+# Credit given when a resume skill relates to a required skill through the graph
+CHILD_CREDIT = 0.8        # resume has a more specific skill (pytorch -> deep learning)
+GRANDCHILD_CREDIT = 0.6   # two levels down (pytorch -> machine learning)
+PARENT_CREDIT = 0.4       # resume has the broader skill (deep learning -> pytorch)
+RELATED_CREDIT = 0.5      # sibling technologies (tensorflow <-> pytorch)
+
+
+class SkillOntology:
+    """Skill graph plus a precomputed embedding matrix for partial skill matching"""
+
+    def __init__(
+        self,
+        skill_extractor: SkillExtractor,
+        embedding_service: EmbeddingService,
+        graph_path: str = "data/skill_graph.json"
+    ):
+        self.settings = get_settings()
+        self.skill_extractor = skill_extractor
+        self.embedding_service = embedding_service
+        self.threshold = self.settings.skill_similarity_threshold
+        self.max_credit = self.settings.skill_partial_credit_max
+
+        with open(graph_path, 'r') as f:
+            graph = json.load(f)
+
+        canonical = self.skill_extractor.canonicalize
+        self.parents: Dict[str, Set[str]] = {}
+        self.children: Dict[str, Set[str]] = {}
+        for child, parents in graph.get("parents", {}).items():
+            for parent in parents:
+                self.parents.setdefault(canonical(child), set()).add(canonical(parent))
+                self.children.setdefault(canonical(parent), set()).add(canonical(child))
+
+        self.related: Dict[str, Set[str]] = {}
+        for a, b in graph.get("related", []):
+            self.related.setdefault(canonical(a), set()).add(canonical(b))
+            self.related.setdefault(canonical(b), set()).add(canonical(a))
+
+        # Taxonomy = every canonical skill we know about
+        self.vocabulary = sorted(
+            self.skill_extractor.normalize(self.skill_extractor.all_skills)
+            | set(self.skill_extractor.synonyms)
+            | set(self.parents) | set(self.children) | set(self.related)
+        )
+        self.index_by_skill = {skill: i for i, skill in enumerate(self.vocabulary)}
+        self.matrix = self._load_or_build_matrix(graph_path)
+        self._lock = threading.Lock()
+
+    def _load_or_build_matrix(self, graph_path: str) -> np.ndarray:
+        """Unit-normalized skill embeddings, cached on disk per model + vocabulary"""
+        digest = hashlib.sha256(
+            json.dumps([self.settings.embedding_model, self.vocabulary]).encode("utf-8")
+        ).hexdigest()[:16]
+        cache_path = os.path.join(self.settings.vector_store_path, f"skill_embeddings_{digest}.npy")
+
+        if os.path.exists(cache_path):
+            matrix = np.load(cache_path)
+            if matrix.shape[0] == len(self.vocabulary):
+                print(f"✅ Loaded {len(self.vocabulary)} skill embeddings from cache")
+                return matrix
+
+        print(f"🧠 Embedding {len(self.vocabulary)} taxonomy skills...")
+        matrix = self._normalize_rows(self.embedding_service.generate_embeddings_batch(self.vocabulary))
+        os.makedirs(self.settings.vector_store_path, exist_ok=True)
+        np.save(cache_path, matrix)
+        return matrix
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).astype('float32')
+
+    def _vectors(self, skills: List[str]) -> np.ndarray:
+        """Rows of the shared matrix for skills, embedding unknown skills once"""
+        unknown = [s for s in skills if s not in self.index_by_skill]
+        if unknown:
+            vectors = self._normalize_rows(self.embedding_service.generate_embeddings_batch(unknown))
+            with self._lock:
+                for skill, vector in zip(unknown, vectors):
+                    if skill not in self.index_by_skill:
+                        self.index_by_skill[skill] = len(self.vocabulary)
+                        self.vocabulary.append(skill)
+                        self.matrix = np.vstack([self.matrix, vector.reshape(1, -1)])
+        return self.matrix[[self.index_by_skill[s] for s in skills]]
+
+    def graph_credit(self, resume_skill: str, job_skill: str) -> float:
+        """Credit from parent/child/related edges between two canonical skills"""
+        parents = self.parents.get(resume_skill, set())
+        if job_skill in parents:
+            return CHILD_CREDIT
+        if any(job_skill in self.parents.get(p, set()) for p in parents):
+            return GRANDCHILD_CREDIT
+        if job_skill in self.related.get(resume_skill, set()):
+            return RELATED_CREDIT
+        if resume_skill in self.parents.get(job_skill, set()):
+            return PARENT_CREDIT
+        return 0.0
+
+    def partial_matches(self, resume_skills: Set[str], missing_skills: List[str]) -> Dict[str, Tuple[str, float]]:
+        """
+        For each missing job skill, the best resume skill and its credit (0..max_credit).
+        Similarities are computed as one (missing x resume) matrix product.
+        """
+        if not resume_skills or not missing_skills:
+            return {}
+
+        resume_list = sorted(resume_skills)
+        similarity = self._vectors(missing_skills) @ self._vectors(resume_list).T
+
+        matches = {}
+        for i, job_skill in enumerate(missing_skills):
+            scores = np.where(similarity[i] >= self.threshold, similarity[i], 0.0)
+            for j, resume_skill in enumerate(resume_list):
+                credit = self.graph_credit(resume_skill, job_skill)
+                if credit > scores[j]:
+                    scores[j] = credit
+
+            best = int(np.argmax(scores))
+            if scores[best] > 0:
+                matches[job_skill] = (resume_list[best], min(float(scores[best]), self.max_credit))
+        return matches
@@ -0,0 +1,271 @@
+import multiprocessing
+import threading
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Optional
+import numpy as np
+from app.config import get_settings
+from app.services.embeddings import EmbeddingService
+from app.services.job_queue import JobQueue, STAGE_PARSE, STAGE_EMBED, STAGE_DONE
+from app.services.parsed_resume import ParsedResume, build_parsed_resume
+from app.services.resume_parser import ResumeParser
+from app.services.skill_extractor import SkillExtractor
+from app.services.vector_store import VectorStore
+
+
+# One SkillExtractor per parse worker process, created on first use
+_worker_skill_extractor: Optional[SkillExtractor] = None
+
+
+def parse_resume_file(resume_id: str, file_path: str, data: Optional[bytes] = None) -> ParsedResume:
+    """Extract text and build a ParsedResume without embedding (runs in a worker process)"""
+    global _worker_skill_extractor
+    if _worker_skill_extractor is None:
+        _worker_skill_extractor = SkillExtractor()
+
+    if data is not None:
+        # Bytes handed over from the upload request - no need to read the file back
+        text = ResumeParser.extract_text_from_bytes(data, file_path.rsplit('.', 1)[-1].lower())
+    elif file_path.endswith('.pdf'):
+        text = ResumeParser.extract_text_from_pdf(file_path)
+    else:
+        text = ResumeParser.extract_text_from_docx(file_path)
+
+    if not text or len(text.strip()) < 10:
+        raise ValueError("Extracted text is too short or empty. Please upload a valid resume.")
+
+    # Embedding is added by the caller, which owns the model
+    return build_parsed_resume(resume_id, text, _worker_skill_extractor)
+
+
+def parse_resume_job(resume_id: str, file_path: str, data: Optional[bytes] = None) -> int:
+    """Parse stage (runs in a worker process): build and persist ParsedResume"""
+    parsed = parse_resume_file(resume_id, file_path, data)
+    parsed.save()
+    return len(parsed.skills)
+
+
+class UploadPipeline:
+    """
+    Runs queued uploads through two worker pools:
+    parsing in separate processes, embedding/indexing in threads sharing the model.
+    Each stage only claims a job when one of its workers is free, so excess
+    uploads wait in the persistent queue instead of piling up in memory.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        embedding_service: EmbeddingService,
+        vector_store: VectorStore,
+        index_sections: Callable[..., int],
+        on_ready: Callable[[dict, ParsedResume], None]
+    ):
+        self.settings = get_settings()
+        self.queue = queue
+        self.embedding_service = embedding_service
+        self.vector_store = vector_store
+        self.index_sections = index_sections
+        self.on_ready = on_ready
+
+        self._stop = threading.Event()
+        self._threads = []
+        self.parse_pool = None
+        self.embed_pool = None
+        self._pool_lock = threading.Lock()
+        # Held while a finished resume is published; deletions wait on it (see cancel)
+        self._publish_lock = threading.Lock()
+
+        # Upload bytes still in memory, handed to the parse worker instead of re-reading the file
+        self._buffers: Dict[str, bytes] = {}
+        self._buffered_bytes = 0
+        self._buffer_lock = threading.Lock()
+
+    def start(self):
+        self.queue.requeue_running()
+        self.parse_pool = self._new_parse_pool()
+        self.embed_pool = ThreadPoolExecutor(
+            max_workers=self.settings.embed_workers,
+            thread_name_prefix="embed-worker"
+        )
+        self._threads = [
+            threading.Thread(
+                target=self._dispatch,
+                args=(STAGE_PARSE, self.settings.parse_workers, self._submit_parse),
+                name="parse-dispatcher",
+                daemon=True
+            ),
+            threading.Thread(
+                target=self._dispatch,
+                args=(STAGE_EMBED, self.settings.embed_workers, self._submit_embed),
+                name="embed-dispatcher",
+                daemon=True
+            ),
+        ]
+        for thread in self._threads:
+            thread.start()
+        print(f"✅ Upload pipeline started ({self.settings.parse_workers} parse, {self.settings.embed_workers} embed workers)")
+
+    def _new_parse_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.settings.parse_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _replace_parse_pool(self, broken: ProcessPoolExecutor):
+        """A worker died (crash, OOM kill) and took the pool with it: start a fresh one"""
+        with self._pool_lock:
+            # Every job of the broken pool reports it; only the first replaces it
+            if self.parse_pool is not broken or self._stop.is_set():
+                return
+            print("⚠️ Parse worker pool broke, starting a new one")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.parse_pool = self._new_parse_pool()
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        if self.parse_pool:
+            self.parse_pool.shutdown(wait=True, cancel_futures=True)
+        if self.embed_pool:
+            self.embed_pool.shutdown(wait=True, cancel_futures=True)
+
+    def is_full(self) -> bool:
+        """Backpressure check for the upload endpoint"""
+        return self.queue.pending_count() >= self.settings.upload_queue_max
+
+    def hold(self, resume_id: str, data: bytes):
+        """Keep an upload's bytes for its parse job, within the memory budget"""
+        with self._buffer_lock:
+            if self._buffered_bytes + len(data) > self.settings.upload_buffer_max_bytes:
+                return
+            self._buffers[resume_id] = data
+            self._buffered_bytes += len(data)
+
+    def discard(self, resume_id: str) -> Optional[bytes]:
+        with self._buffer_lock:
+            data = self._buffers.pop(resume_id, None)
+            if data is not None:
+                self._buffered_bytes -= len(data)
+            return data
+
+    def cancel(self, resume_ids: Iterable[str]):
+        """
+        For deleted uploads, after their jobs are removed from the queue: drops
+        held bytes and waits for a publish already under way, so the caller's
+        cleanup runs after it and nothing is left behind.
+        """
+        with self._publish_lock:
+            for resume_id in resume_ids:
+                self.discard(resume_id)
+
+    def _dispatch(self, stage: str, workers: int, submit: Callable[[dict], Future]):
+        """Claim jobs for a stage whenever a worker slot is free"""
+        slots = threading.BoundedSemaphore(workers)
+        while not self._stop.is_set():
+            if not slots.acquire(timeout=self.settings.job_poll_interval):
+                continue
+
+            job = self.queue.claim(stage)
+            if job is None:
+                slots.release()
+                self._stop.wait(self.settings.job_poll_interval)
+                continue
+
+            try:
+                future = submit(job)
+            except Exception as e:
+                slots.release()
+                self._fail(job, e)
+                continue
+            future.add_done_callback(lambda f, job=job: self._finish(stage, job, f, slots))
+
+    def _submit_parse(self, job: dict) -> Future:
+        print(f"📖 Parsing {job['resume_id']} in worker pool...")
+        data = self.discard(job["resume_id"])
+        pool = self.parse_pool
+        try:
+            future = pool.submit(parse_resume_job, job["resume_id"], job["file_path"], data)
+        except BrokenProcessPool:
+            self._replace_parse_pool(pool)
+            pool = self.parse_pool
+            future = pool.submit(parse_resume_job, job["resume_id"], job["file_path"], data)
+
+        def replace_if_broken(done: Future):
+            if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+                self._replace_parse_pool(pool)
+
+        # Runs before _finish (callbacks fire in order), so a requeued job gets the new pool
+        future.add_done_callback(replace_if_broken)
+        return future
+
+    def _submit_embed(self, job: dict) -> Future:
+        print(f"🧠 Embedding {job['resume_id']} in worker pool...")
+        return self.embed_pool.submit(self._embed_and_index, job)
+
+    def _finish(self, stage: str, job: dict, future: Future, slots: threading.BoundedSemaphore):
+        slots.release()
+        resume_id = job["resume_id"]
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool) and job["attempts"] + 1 < self.settings.parse_max_attempts:
+            # Lost with the pool, maybe through no fault of its own: parse it again
+            print(f"🔁 Requeueing {resume_id} after the parse pool broke")
+            self.queue.requeue(resume_id)
+            return
+        if error is not None:
+            self._fail(job, error)
+            return
+        if stage == STAGE_PARSE and self.queue.get(resume_id) is None:
+            # Deleted while it was parsing; the worker has just written its parsed form
+            ParsedResume.delete(resume_id)
+            return
+        self.queue.advance(resume_id, STAGE_EMBED if stage == STAGE_PARSE else STAGE_DONE)
+
+    def _fail(self, job: dict, error: BaseException):
+        print(f"❌ Upload {job['resume_id']} failed: {error}")
+        traceback.print_exception(type(error), error, error.__traceback__)
+        self.queue.fail(job["resume_id"], str(error))
+
+    def _embed_and_index(self, job: dict):
+        """Embed stage: document + section embeddings, vector store, then publish"""
+        resume_id = job["resume_id"]
+        if self.queue.get(resume_id) is None:
+            ParsedResume.delete(resume_id)
+            return
+        parsed = ParsedResume.load(resume_id)
+        if parsed is None:
+            raise ValueError("Parsed resume missing - parse stage did not complete")
+
+        parsed.embedding = self.embedding_service.generate_embedding(parsed.text[:5000])
+        embedding_array = np.array([parsed.embedding]).astype('float32')
+        if embedding_array.shape[1] != self.settings.vector_dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: got {embedding_array.shape[1]}, "
+                f"expected {self.settings.vector_dimension}"
+            )
+
+        # Section embeddings too, before any lock: searches keep running meanwhile
+        section_embeddings = (
+            self.embedding_service.generate_embeddings_batch([chunk["text"] for chunk in parsed.sections])
+            if parsed.sections else None
+        )
+
+        with self._publish_lock:
+            # Deleted while it was embedding: don't publish it (see cancel)
+            if self.queue.get(resume_id) is None:
+                ParsedResume.delete(resume_id)
+                return
+            # One resume's vectors go in together; searches never see half of them
+            with self.vector_store.lock:
+                self.vector_store.add_documents(
+                    embeddings=embedding_array,
+                    documents=[parsed.text[:5000]],
+                    metadata=[{"resume_id": resume_id, "user_id": job["user_id"], "type": "resume"}]
+                )
+                self.index_sections(resume_id, job["user_id"], parsed.sections, embeddings=section_embeddings)
+            parsed.save()
+            self.on_ready(job, parsed)
+        self.vector_store.save()
+        print(f"✅ Resume {resume_id} processed")
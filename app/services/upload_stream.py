@@ -0,0 +1,91 @@
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from fastapi import UploadFile
+
+
+# Leading bytes of each accepted file type (DOCX is a ZIP container)
+MAGIC_BYTES = {
+    "pdf": b"%PDF-",
+    "docx": b"PK\x03\x04",
+}
+
+MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+class UploadTypeError(ValueError):
+    pass
+
+
+@dataclass(slots=True)
+class StoredUpload:
+    """An upload written to disk, with what was learned while streaming it"""
+    path: str
+    extension: str
+    sha256: str
+    size: int
+    data: bytes
+
+
+def size_limit_message(max_bytes: int) -> str:
+    return f"File exceeds the {round(max_bytes / (1024 * 1024), 1):g} MB upload limit"
+
+
+def check_magic(head: bytes, extension: str):
+    """Reject files whose content doesn't match their extension"""
+    magic = MAGIC_BYTES.get(extension)
+    if magic is None or not head.startswith(magic):
+        raise UploadTypeError(f"File content is not a valid {extension.upper()} document")
+
+
+async def stream_upload(
+    file: UploadFile, dest_path: str, extension: str, max_bytes: int, chunk_size: int
+) -> StoredUpload:
+    """
+    Copy an upload to dest_path in bounded chunks, hashing and type-checking
+    as it goes. Stops as soon as the size limit is passed; nothing is left on
+    disk for rejected files. The bytes are kept so parsing needs no re-read.
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    partial_path = f"{dest_path}.part"
+
+    try:
+        with open(partial_path, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                if size == 0:
+                    check_magic(chunk, extension)
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(size_limit_message(max_bytes))
+                digest.update(chunk)
+                chunks.append(chunk)
+                await asyncio.to_thread(out.write, chunk)
+
+        if size == 0:
+            raise UploadTypeError("Uploaded file is empty")
+        os.replace(partial_path, dest_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    return StoredUpload(
+        path=dest_path,
+        extension=extension,
+        sha256=digest.hexdigest(),
+        size=size,
+        data=b"".join(chunks)
+    )
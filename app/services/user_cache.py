@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+from app.config import get_settings
+
+
+@dataclass(slots=True)
+class AuthenticatedUser:
+    """Read-only snapshot of the user fields endpoints need"""
+    id: str
+    email: str
+    username: str
+    full_name: Optional[str]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            created_at=user.created_at
+        )
+
+    def claims(self) -> dict:
+        """Token claims for stateless auth"""
+        return {
+            "sub": self.id,
+            "email": self.email,
+            "username": self.username,
+            "name": self.full_name,
+            "created": self.created_at.isoformat() if self.created_at else None
+        }
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["AuthenticatedUser"]:
+        """Rebuild from token claims; None for tokens issued without them"""
+        if "email" not in payload or "username" not in payload:
+            return None
+        created = payload.get("created")
+        return cls(
+            id=payload["sub"],
+            email=payload["email"],
+            username=payload["username"],
+            full_name=payload.get("name"),
+            created_at=datetime.fromisoformat(created) if created else None
+        )
+
+
+class UserCache:
+    """In-process TTL cache of authenticated users keyed by token subject"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.ttl_seconds = self.settings.user_cache_ttl_seconds
+        self.max_entries = self.settings.user_cache_max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Deleted accounts, kept until their last token could have expired
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[AuthenticatedUser]:
+        """Cached user, or None if missing/expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or now - entry[1] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user: AuthenticatedUser):
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic())
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str, revoke_seconds: float = 0):
+        """Drop a user; revoke_seconds also rejects their stateless tokens for that long"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            if revoke_seconds > 0:
+                now = time.monotonic()
+                self._revoked = {uid: until for uid, until in self._revoked.items() if until > now}
+                self._revoked[user_id] = now + revoke_seconds
+
+    def is_revoked(self, user_id: str) -> bool:
+        with self._lock:
+            until = self._revoked.get(user_id)
+        return until is not None and until > time.monotonic()
+
+    def stats(self) -> dict:
+        """Hit/miss metrics for monitoring"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
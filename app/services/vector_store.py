@@ -2,7 +2,8 @@ import faiss
 import numpy as np
 import pickle
 import os
-from typing import List, Tuple
+import threading
+from typing import Dict, Iterable, List, Tuple
 from app.config import get_settings
 
 class VectorStore:
@@ -12,6 +13,12 @@ class VectorStore:
         self.index = faiss.IndexFlatL2(self.dimension)
         self.documents = []
         self.metadata = []
+        self._ids_by_resume: Dict[str, List[int]] = {}
+        # Guards the index and its parallel lists; callers composing several
+        # calls (check, add, save) can hold it too, it is reentrant
+        self.lock = threading.RLock()
+        # Orders snapshots written to disk, so an older one never lands last
+        self._save_lock = threading.Lock()
         
         os.makedirs(self.settings.vector_store_path, exist_ok=True)
         self.index_path = f"{self.settings.vector_store_path}/faiss.index"
@@ -19,41 +26,113 @@ class VectorStore:
     
     def add_documents(self, embeddings: np.ndarray, documents: List[str], metadata: List[dict]):
         """Add documents with embeddings to FAISS index"""
-        self.index.add(embeddings)
-        self.documents.extend(documents)
-        self.metadata.extend(metadata)
+        with self.lock:
+            start = self.index.ntotal
+            self.index.add(embeddings)
+            self.documents.extend(documents)
+            self.metadata.extend(metadata)
+            for offset, meta in enumerate(metadata):
+                self._register(start + offset, meta)
+    
+    def remove_resumes(self, resume_ids: Iterable[str]) -> int:
+        """
+        Tombstone every vector of the given resumes in one pass. The vectors stay
+        in the flat index (removing them would renumber every later id), but their
+        text and metadata are dropped and they are never returned again.
+        """
+        removed = 0
+        with self.lock:
+            for resume_id in resume_ids:
+                for idx in self._ids_by_resume.pop(resume_id, []):
+                    self.documents[idx] = ""
+                    self.metadata[idx] = {"type": "deleted"}
+                    removed += 1
+        return removed
+    
+    def _register(self, idx: int, meta: dict):
+        """Track which vector ids belong to which resume"""
+        resume_id = meta.get("resume_id")
+        if resume_id:
+            self._ids_by_resume.setdefault(resume_id, []).append(idx)
+    
+    def has_documents(self, resume_id: str, doc_type: str) -> bool:
+        """Check whether any documents of a type are stored for a resume"""
+        with self.lock:
+            return any(
+                self.metadata[idx].get("type") == doc_type
+                for idx in self._ids_by_resume.get(resume_id, [])
+            )
+    
+    def search_resume(
+        self, query_embedding: np.ndarray, resume_id: str, doc_type: str, k: int = 4
+    ) -> List[Tuple[str, dict, float]]:
+        """Search only among one resume's documents of the given type"""
+        query_embedding = query_embedding.reshape(1, -1).astype('float32')
+        with self.lock:
+            ids = [
+                idx for idx in self._ids_by_resume.get(resume_id, [])
+                if self.metadata[idx].get("type") == doc_type
+            ]
+            if not ids:
+                return []
+            
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(np.array(ids, dtype='int64')))
+            distances, indices = self.index.search(query_embedding, min(k, len(ids)), params=params)
+            
+            return [
+                (self.documents[idx], self.metadata[idx], float(distances[0][i]))
+                for i, idx in enumerate(indices[0])
+                if 0 <= idx < len(self.documents)
+            ]
     
     def search(self, query_embedding: np.ndarray, k: int = 5) -> List[Tuple[str, dict, float]]:
         """Search for similar documents"""
         query_embedding = query_embedding.reshape(1, -1).astype('float32')
-        distances, indices = self.index.search(query_embedding, k)
-        
         results = []
-        for i, idx in enumerate(indices[0]):
-            if idx < len(self.documents):
-                results.append((
-                    self.documents[idx],
-                    self.metadata[idx],
-                    float(distances[0][i])
-                ))
+        with self.lock:
+            distances, indices = self.index.search(query_embedding, k)
+            for i, idx in enumerate(indices[0]):
+                if 0 <= idx < len(self.documents) and self.metadata[idx].get("type") != "deleted":
+                    results.append((
+                        self.documents[idx],
+                        self.metadata[idx],
+                        float(distances[0][i])
+                    ))
         return results
     
     def save(self):
         """Save index and metadata to disk"""
-        faiss.write_index(self.index, self.index_path)
-        with open(self.metadata_path, 'wb') as f:
-            pickle.dump({
-                'documents': self.documents,
-                'metadata': self.metadata
-            }, f)
+        with self._save_lock:
+            # Snapshot in memory under the lock; the slow disk writes happen outside it
+            with self.lock:
+                index_bytes = faiss.serialize_index(self.index)
+                metadata_bytes = pickle.dumps({
+                    'documents': self.documents,
+                    'metadata': self.metadata
+                })
+            # Temp file then rename, so a crash or a concurrent load never sees a partial file
+            self._write_atomic(self.index_path, index_bytes.tobytes())
+            self._write_atomic(self.metadata_path, metadata_bytes)
+    
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
     
     def load(self):
         """Load index and metadata from disk"""
         if os.path.exists(self.index_path) and os.path.exists(self.metadata_path):
-            self.index = faiss.read_index(self.index_path)
+            index = faiss.read_index(self.index_path)
             with open(self.metadata_path, 'rb') as f:
                 data = pickle.load(f)
+            with self.lock:
+                self.index = index
                 self.documents = data['documents']
                 self.metadata = data['metadata']
+                self._ids_by_resume = {}
+                for idx, meta in enumerate(self.metadata):
+                    self._register(idx, meta)
             return True
         return False
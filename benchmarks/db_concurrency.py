@@ -0,0 +1,153 @@
+# Mixed read/write throughput of the database engine under concurrent requests.
+#
+#   python benchmarks/db_concurrency.py --threads 16 --seconds 10
+#   python benchmarks/db_concurrency.py --url postgresql+psycopg2://user:pw@localhost/bench
+#
+# Threads play API workers: most requests read a history page, the rest save
+# a chat history row and commit. Compares the previous engine setup (plain
+# SQLite, rollback journal) with app.database.create_database_engine, and
+# optionally any other URL. Each run uses its own throwaway database.
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep app.database's import-time setup away from the real database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from models import Base, User, ChatHistory
+from app.database import create_database_engine
+from app.migrations import ensure_indexes
+
+
+def seed(engine, users: int, rows: int):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": user_id, "email": f"user{i}@example.com", "username": f"user{i}",
+             "hashed_password": "x", "created_at": start}
+            for i, user_id in enumerate(user_ids)
+        ])
+        conn.execute(ChatHistory.__table__.insert(), [
+            {"user_id": rng.choice(user_ids), "resume_id": "seed", "user_query": "How do I grow?",
+             "ai_response": "Practice. " * 40, "created_at": start + timedelta(seconds=i)}
+            for i in range(rows)
+        ])
+    return user_ids
+
+
+def run_load(engine, user_ids, threads: int, seconds: float, write_ratio: float) -> dict:
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    reads, writes, errors = [], [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed_value: int):
+        rng = random.Random(seed_value)
+        local_reads, local_writes, local_errors = [], [], []
+        while time.perf_counter() < deadline:
+            user_id = rng.choice(user_ids)
+            is_write = rng.random() < write_ratio
+            db = Session()
+            started = time.perf_counter()
+            try:
+                if is_write:
+                    db.add(ChatHistory(user_id=user_id, resume_id="bench", user_query="q",
+                                       ai_response="Practice. " * 40))
+                    db.commit()
+                else:
+                    db.query(ChatHistory.id, ChatHistory.user_query, ChatHistory.created_at)\
+                        .filter(ChatHistory.user_id == user_id)\
+                        .order_by(ChatHistory.created_at.desc(), ChatHistory.id.desc()).limit(21).all()
+                elapsed = (time.perf_counter() - started) * 1000
+                (local_writes if is_write else local_reads).append(elapsed)
+            except OperationalError as e:
+                db.rollback()
+                local_errors.append(str(e.orig))
+            finally:
+                db.close()
+        with lock:
+            reads.extend(local_reads)
+            writes.extend(local_writes)
+            errors.extend(local_errors)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    def percentile(values, pct):
+        if not values:
+            return 0.0
+        return statistics.quantiles(values, n=100)[pct - 1] if len(values) > 1 else values[0]
+
+    return {
+        "ops_per_sec": (len(reads) + len(writes)) / seconds,
+        "writes_per_sec": len(writes) / seconds,
+        "read_p50": percentile(reads, 50),
+        "read_p95": percentile(reads, 95),
+        "write_p50": percentile(writes, 50),
+        "write_p95": percentile(writes, 95),
+        "errors": len(errors),
+        "sample_error": errors[0] if errors else "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent mixed read/write database benchmark")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=50_000, help="Chat history rows seeded before the run")
+    parser.add_argument("--url", help="Extra empty database to benchmark with the tuned engine (tables are dropped afterwards)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        setups = [
+            ("sqlite default", lambda: create_engine(
+                f"sqlite:///{workdir}/default.db", connect_args={"check_same_thread": False}
+            ), False),
+            ("sqlite tuned", lambda: create_database_engine(f"sqlite:///{workdir}/tuned.db"), False),
+        ]
+        if args.url:
+            setups.append((args.url.split(":", 1)[0], lambda: create_database_engine(args.url), True))
+
+        results = {}
+        for name, make_engine, drop_after in setups:
+            engine = make_engine()
+            Base.metadata.create_all(bind=engine)
+            ensure_indexes(engine)
+            user_ids = seed(engine, args.users, args.rows)
+            print(f"⏳ {name}: {args.threads} threads for {args.seconds:g}s, {args.write_ratio:.0%} writes...")
+            results[name] = run_load(engine, user_ids, args.threads, args.seconds, args.write_ratio)
+            if drop_after:
+                Base.metadata.drop_all(bind=engine)
+            engine.dispose()
+
+    print(f"\n{'setup':<16}{'ops/s':>9}{'writes/s':>10}{'read p50':>10}{'read p95':>10}"
+          f"{'write p50':>11}{'write p95':>11}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<16}{r['ops_per_sec']:>9.0f}{r['writes_per_sec']:>10.0f}{r['read_p50']:>10.2f}"
+              f"{r['read_p95']:>10.2f}{r['write_p50']:>11.2f}{r['write_p95']:>11.2f}{r['errors']:>8}")
+    for name, r in results.items():
+        if r["sample_error"]:
+            print(f"   {name}: {r['sample_error']}")
+    print("(latencies in ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# Query latency for the API's hot lookups before and after app.migrations.ensure_indexes.
+#
+#   python benchmarks/history_indexes.py --rows 1000000
+#
+# Builds a throwaway SQLite database (the app database is not touched), fills
+# it with users, resumes and history rows, then times each query with and
+# without the access-pattern indexes and prints the SQLite query plans.
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, exists, func, select, text
+from models import Base, User, UserResume, JobMatchHistory, ChatHistory
+import app.db_models  # noqa: F401 - registers the app-owned tables on Base
+from app.migrations import ensure_indexes
+
+
+def populate(engine, users: int, resumes_per_user: int, history_rows: int):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    resume_ids = {user_id: [str(uuid.uuid4()) for _ in range(resumes_per_user)] for user_id in user_ids}
+    skills = json.dumps(["python", "sql", "docker"])
+
+    def batches(rows, size=50_000):
+        for i in range(0, len(rows), size):
+            yield rows[i:i + size]
+
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": user_id, "email": f"user{i}@example.com", "username": f"user{i}",
+             "hashed_password": "x", "created_at": start}
+            for i, user_id in enumerate(user_ids)
+        ])
+        conn.execute(UserResume.__table__.insert(), [
+            {"user_id": user_id, "resume_id": resume_id, "filename": "resume.pdf",
+             "skills_count": rng.randint(0, 30), "extracted_text": "",
+             "uploaded_at": start + timedelta(minutes=rng.randint(0, 500_000))}
+            for user_id, ids in resume_ids.items() for resume_id in ids
+        ])
+
+        # Half match history, half chat history, spread over all users
+        for table, make in (
+            (JobMatchHistory.__table__, lambda user_id, when: {
+                "user_id": user_id, "resume_id": resume_ids[user_id][0],
+                "job_description": "Job description preview", "job_title": "Engineer",
+                "match_score": round(rng.uniform(20, 95), 1), "matched_skills": skills,
+                "missing_skills": skills, "recommendations": "Keep going", "created_at": when
+            }),
+            (ChatHistory.__table__, lambda user_id, when: {
+                "user_id": user_id, "resume_id": resume_ids[user_id][0],
+                "user_query": "How do I grow?", "ai_response": "Practice.", "created_at": when
+            }),
+        ):
+            rows = [
+                make(rng.choice(user_ids), start + timedelta(seconds=rng.randint(0, 50_000_000)))
+                for _ in range(history_rows // 2)
+            ]
+            for batch in batches(rows):
+                conn.execute(table.insert(), batch)
+
+    return user_ids, resume_ids
+
+
+def build_queries(user_ids, resume_ids):
+    rng = random.Random(7)
+
+    def ownership():
+        user_id = rng.choice(user_ids)
+        return select(exists().where(
+            UserResume.resume_id == rng.choice(resume_ids[user_id]), UserResume.user_id == user_id
+        ))
+
+    def match_page():
+        return select(JobMatchHistory.id, JobMatchHistory.job_title, JobMatchHistory.match_score,
+                      JobMatchHistory.created_at)\
+            .where(JobMatchHistory.user_id == rng.choice(user_ids))\
+            .order_by(JobMatchHistory.created_at.desc(), JobMatchHistory.id.desc()).limit(21)
+
+    def chat_page():
+        return select(ChatHistory.id, ChatHistory.user_query, ChatHistory.created_at)\
+            .where(ChatHistory.user_id == rng.choice(user_ids))\
+            .order_by(ChatHistory.created_at.desc(), ChatHistory.id.desc()).limit(21)
+
+    def dashboard():
+        user_id = rng.choice(user_ids)
+        return select(
+            select(func.count()).where(JobMatchHistory.user_id == user_id).scalar_subquery(),
+            select(func.max(JobMatchHistory.match_score)).where(JobMatchHistory.user_id == user_id).scalar_subquery(),
+            select(func.count()).where(ChatHistory.user_id == user_id).scalar_subquery(),
+        )
+
+    def my_resumes():
+        return select(UserResume.resume_id, UserResume.filename)\
+            .where(UserResume.user_id == rng.choice(user_ids)).order_by(UserResume.uploaded_at.desc())
+
+    def login():
+        return select(User.id).where(User.email == f"user{rng.randrange(len(user_ids))}@example.com")
+
+    return {
+        "ownership check": ownership,
+        "match history page": match_page,
+        "chat history page": chat_page,
+        "dashboard aggregates": dashboard,
+        "my resumes": my_resumes,
+        "login by email": login,
+    }
+
+
+def time_queries(engine, queries, repeat: int):
+    results = {}
+    with engine.connect() as conn:
+        for name, make in queries.items():
+            timings = []
+            for _ in range(repeat):
+                statement = make()
+                started = time.perf_counter()
+                conn.execute(statement).all()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(timings)
+    return results
+
+
+def query_plans(engine, queries):
+    plans = {}
+    with engine.connect() as conn:
+        for name, make in queries.items():
+            compiled = make().compile(engine, compile_kwargs={"literal_binds": True})
+            rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+            plans[name] = [row[-1] for row in rows]
+    return plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="History rows (split between matches and chats)")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--resumes-per-user", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        engine = create_engine(f"sqlite:///{workdir}/bench.db")
+        Base.metadata.create_all(bind=engine)
+
+        print(f"⏳ Loading {args.users} users, {args.users * args.resumes_per_user} resumes, {args.rows} history rows...")
+        started = time.perf_counter()
+        user_ids, resume_ids = populate(engine, args.users, args.resumes_per_user, args.rows)
+        print(f"   loaded in {time.perf_counter() - started:.1f}s")
+
+        queries = build_queries(user_ids, resume_ids)
+        before = time_queries(engine, queries, args.repeat)
+
+        started = time.perf_counter()
+        created = ensure_indexes(engine)
+        print(f"   {len(created)} indexes built in {time.perf_counter() - started:.1f}s")
+
+        queries = build_queries(user_ids, resume_ids)
+        after = time_queries(engine, queries, args.repeat)
+
+        print(f"\n{'query':<24}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+        for name in queries:
+            speedup = before[name] / after[name] if after[name] else float("inf")
+            print(f"{name:<24}{before[name]:>14.3f}{after[name]:>14.3f}{speedup:>9.1f}x")
+
+        print("\nQuery plans with indexes:")
+        for name, plan in query_plans(engine, queries).items():
+            print(f"  {name}:")
+            for step in plan:
+                print(f"    {step}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import time
 from datetime import datetime
 
 
@@ -32,6 +33,8 @@ session_defaults = {
     'match_scores': [],           # ✅ NEW: Track all match scores
     'best_match_score': 0,        # ✅ NEW: Best match achieved
     'avg_match_score': 0,         # ✅ NEW: Average match score
+    'chat_history_shown': 20,     # History items loaded so far ("Load more" adds a page)
+    'match_history_shown': 20,
 }
 
 for key, value in session_defaults.items():
@@ -392,6 +395,24 @@ def api_call(method, endpoint, **kwargs):
         return None
 
 
+def fetch_history(endpoint, items_key, limit, **params):
+    """Fetch up to `limit` newest history items, following pagination cursors"""
+    items, cursor = [], None
+    while len(items) < limit:
+        query = {**params, "limit": min(100, limit - len(items))}
+        if cursor:
+            query["cursor"] = cursor
+        response = api_call("GET", endpoint, params=query)
+        if not response or response.status_code != 200:
+            return None, False
+        data = response.json()
+        items.extend(data.get(items_key, []))
+        cursor = data.get("next_cursor")
+        if not cursor:
+            break
+    return items, cursor is not None
+
+
 # ==================== LANDING PAGE ====================
 def show_landing_page():
     """Landing page with authentication"""
@@ -530,34 +551,17 @@ def show_home_page():
     total_skills = 0
     total_domains = 0
     
-    # Get resume count
-    resumes_response = api_call("GET", "/my-resumes")
-    if resumes_response and resumes_response.status_code == 200:
-        resumes_data = resumes_response.json()
-        resume_count = resumes_data.get("count", 0)
-        
-        # Get skills/domains from first resume if available
-        resumes_list = resumes_data.get("resumes", [])
-        if resumes_list and len(resumes_list) > 0:
-            first_resume = resumes_list[0]
-            total_skills = first_resume.get("skills_count", 0)
-    
-    # Get match history count
-    match_response = api_call("GET", "/match-history")
-    if match_response and match_response.status_code == 200:
-        matches_data = match_response.json()
-        matches_list = matches_data.get("matches", [])
-        match_count = len(matches_list)
-        
-        # Get best match score
-        if matches_list:
-            best_match_score = max([m.get('match_score', 0) for m in matches_list])
-    
-    # Get chat history count
-    chat_response = api_call("GET", "/chat-history")
-    if chat_response and chat_response.status_code == 200:
-        chats_data = chat_response.json()
-        advice_count = len(chats_data.get("chats", []))
+    # All counts come from one aggregated call
+    recent_activity = []
+    dashboard_response = api_call("GET", "/dashboard")
+    if dashboard_response and dashboard_response.status_code == 200:
+        dashboard = dashboard_response.json()
+        resume_count = dashboard.get("resume_count", 0)
+        total_skills = dashboard.get("latest_resume_skills", 0)
+        match_count = dashboard.get("match_count", 0)
+        best_match_score = dashboard.get("best_match_score", 0)
+        advice_count = dashboard.get("advice_count", 0)
+        recent_activity = dashboard.get("recent_activity", [])
     
     # ==================== GAMIFIED CAREER READINESS SCORE ====================
     profile_score = 0
@@ -723,6 +727,22 @@ def show_home_page():
                 <p style="margin: 0.5rem 0; font-size: 0.9rem;">• Ask specific career questions</p>
             </div>
         """, unsafe_allow_html=True)
+    
+    if recent_activity:
+        st.markdown("<br><h3 style='margin: 0 0 1rem 0;'>🕒 Recent Activity</h3>", unsafe_allow_html=True)
+        for item in recent_activity:
+            created_date = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
+            date_str = created_date.strftime("%b %d, %Y • %I:%M %p")
+            if item['type'] == "match":
+                label = f"🎯 {item['title']} — {item['score']}%"
+            else:
+                label = f"💬 {item['title']}"
+            st.markdown(f"""
+                <div class="modern-card" style="padding: 0.8rem 1rem;">
+                    <p style="margin: 0; color: var(--text-primary);">{label}</p>
+                    <p style="margin: 0.2rem 0 0 0; color: var(--text-muted); font-size: 0.8rem;">{date_str}</p>
+                </div>
+            """, unsafe_allow_html=True)
 
 # ==================== UPLOAD RESUME PAGE ====================
 def show_upload_page():
@@ -746,8 +766,21 @@ def show_upload_page():
                 files = {"file": (uploaded_file.name, uploaded_file, uploaded_file.type)}
                 response = api_call("POST", "/upload-resume", files=files)
                 
+                # Processing runs in the background - poll until it finishes
+                data = {}
                 if response and response.status_code == 200:
                     data = response.json()
+                    deadline = time.time() + 180
+                    while data.get('status') == 'processing' and time.time() < deadline:
+                        time.sleep(1)
+                        status_response = api_call("GET", f"/resume/{data.get('resume_id')}/status")
+                        if not status_response or status_response.status_code != 200:
+                            break
+                        data = status_response.json()
+                    if data.get('status') != 'done':
+                        response = None
+                
+                if response and response.status_code == 200:
                     st.session_state.resume_id = data.get('resume_id')
                     st.session_state.resume_data = data
                     st.success("✅ Resume analyzed successfully!")
@@ -787,6 +820,10 @@ def show_upload_page():
                     with col2:
                         if st.button("💬 Get Career Advice", use_container_width=True):
                             smooth_transition("💬 Career Advice")
+                elif data.get('status') == 'processing':
+                    st.info("⏳ Your resume is still being processed. Check the My Resumes page shortly.")
+                elif response is not None and response.status_code in (400, 413):
+                    st.error(f"❌ {response.json().get('detail', 'Invalid file')}")
                 else:
                     st.error("❌ Failed to analyze resume. Please try again.")
 
@@ -882,6 +919,13 @@ def show_job_match_page():
                                 """, unsafe_allow_html=True)
                         else:
                             st.info("No exact skill matches found")
+                        
+                        for skill in result.get('partial_matches', []):
+                            st.markdown(f"""
+                                <div style='background: rgba(6, 182, 212, 0.1); padding: 0.5rem 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 3px solid #06b6d4;'>
+                                    ≈ {skill}
+                                </div>
+                            """, unsafe_allow_html=True)
                     
                     with col2:
                         st.markdown("<h3>📚 Skills to Develop</h3>", unsafe_allow_html=True)
@@ -933,9 +977,8 @@ def show_career_advice_page():
         st.markdown("<br><hr style='border: none; border-top: 1px solid rgba(128, 128, 128, 0.2);'><br>", unsafe_allow_html=True)
         st.markdown("### 📜 Previous Conversations")
         
-        chat_response = api_call("GET", "/chat-history")
-        if chat_response and chat_response.status_code == 200:
-            chats = chat_response.json().get('chats', [])
+        chats, _ = fetch_history("/chat-history", "chats", 20)
+        if chats is not None:
             if chats:
                 st.info("You can view your previous conversations below.")
                 for chat in chats:
@@ -1040,18 +1083,15 @@ def show_career_advice_page():
     st.markdown("### 📜 Previous Conversations")
     st.markdown("<p style='color: var(--text-muted); margin-bottom: 1.5rem;'>Click on any conversation to view details</p>", unsafe_allow_html=True)
     
-    # Fetch chat history
-    response = api_call("GET", "/chat-history")
+    # Fetch chat history (newest pages first)
+    chats, has_more = fetch_history("/chat-history", "chats", st.session_state.chat_history_shown)
     
-    if response and response.status_code == 200:
-        data = response.json()
-        chats = data.get('chats', [])
-        
+    if chats is not None:
         if not chats:
             st.info("📭 No conversations yet. Ask your first question above!")
         else:
-            # Show total count
-            st.markdown(f"<p style='color: var(--text-muted); font-size: 0.9rem; margin-bottom: 1rem;'>Total: {len(chats)} conversations</p>", unsafe_allow_html=True)
+            # Show loaded count
+            st.markdown(f"<p style='color: var(--text-muted); font-size: 0.9rem; margin-bottom: 1rem;'>Showing {len(chats)} conversations</p>", unsafe_allow_html=True)
             
             # Show each chat in expander (collapsed by default)
             for chat in chats:
@@ -1090,6 +1130,10 @@ def show_career_advice_page():
                             if del_response and del_response.status_code == 200:
                                 st.success("✅ Deleted!")
                                 st.rerun()
+            
+            if has_more and st.button("⬇️ Load more conversations", use_container_width=True):
+                st.session_state.chat_history_shown += 20
+                st.rerun()
     else:
         st.error("❌ Failed to load chat history")
 
@@ -1143,7 +1187,11 @@ def show_resumes_page():
                 col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
                 
                 with col1:
-                    view_url = f"{API_URL}/resume/{resume.get('resume_id')}/view?token={st.session_state.access_token}"
+                    # Signed short-lived link (cacheable); older resumes fall back to the token link
+                    if resume.get('view_url'):
+                        view_url = f"{API_URL}{resume['view_url']}"
+                    else:
+                        view_url = f"{API_URL}/resume/{resume.get('resume_id')}/view?token={st.session_state.access_token}"
                     st.markdown(f"""
                         <a href="{view_url}" target="_blank" style="
                             display: block;
@@ -1198,19 +1246,20 @@ def show_match_history_page():
     st.markdown("<h1 style='margin-bottom: 1rem;'>📊 Match History</h1>", unsafe_allow_html=True)
     st.markdown("<p style='color: var(--text-muted); margin-bottom: 2rem;'>View your previous job match analyses.</p>", unsafe_allow_html=True)
     
-    response = api_call("GET", "/match-history")
+    # Everything but the full job description, which is fetched on demand
+    matches, has_more = fetch_history(
+        "/match-history", "matches", st.session_state.match_history_shown,
+        fields="job_title,resume_id,match_score,matched_skills,missing_skills,recommendations"
+    )
     
-    if response and response.status_code == 200:
-        data = response.json()
-        matches = data.get('matches', [])
-        
+    if matches is not None:
         if not matches:
             st.info("📭 No match history yet. Start by matching your resume with a job!")
             if st.button("🎯 Match with Jobs", use_container_width=True):
                 smooth_transition("🎯 Job Match")
             return
         
-        st.metric("📊 Total Matches", len(matches))
+        st.metric("📊 Matches Shown", len(matches))
         st.markdown("<br>", unsafe_allow_html=True)
         
         for match in matches:
@@ -1283,7 +1332,10 @@ def show_match_history_page():
                 
                 st.markdown("<br>", unsafe_allow_html=True)
                 st.markdown("### 📄 Job Description")
-                st.text_area("", match['job_description'], height=150, key=f"jd_{match['id']}", disabled=True)
+                if st.button("📄 Show Job Description", key=f"jd_btn_{match['id']}"):
+                    detail_response = api_call("GET", f"/match-history/{match['id']}")
+                    if detail_response and detail_response.status_code == 200:
+                        st.text_area("", detail_response.json()['job_description'], height=150, key=f"jd_{match['id']}", disabled=True)
                 
                 st.markdown("<br>", unsafe_allow_html=True)
                 col1, col2, col3 = st.columns([2, 1, 1])
@@ -1295,6 +1347,10 @@ def show_match_history_page():
                             st.rerun()
             
             st.markdown("<div style='height: 0.5rem'></div>", unsafe_allow_html=True)
+        
+        if has_more and st.button("⬇️ Load more matches", use_container_width=True):
+            st.session_state.match_history_shown += 20
+            st.rerun()
     
     else:
         st.error("❌ Failed to load match history")
@@ -0,0 +1,35 @@
+import os
+import shutil
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def app_client(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("app")
+    shutil.copytree(os.path.join(ROOT, "data"), workdir / "data")
+    (workdir / "uploads").mkdir()
+    previous = os.getcwd()
+    os.chdir(workdir)
+
+    env = pytest.MonkeyPatch()
+    env.setenv("GROQ_API_KEY", "test-key")
+    env.setenv("DATABASE_URL", f"sqlite:///{workdir}/app.db")
+    env.setenv("JOB_POLL_INTERVAL", "0.05")
+    # Every request must reach the gateway, not a cached answer
+    env.setenv("LLM_CACHE_ENABLED", "false")
+
+    from app.config import get_settings
+    get_settings.cache_clear()
+    from fastapi.testclient import TestClient
+    import app.main as main
+
+    with TestClient(main.app) as test_client:
+        yield main, test_client
+
+    env.undo()
+    get_settings.cache_clear()
+    os.chdir(previous)
@@ -0,0 +1,86 @@
+import hashlib
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import get_settings
+
+
+CONTENT = b"%PDF-1.4 resume"
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def store_and_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    get_settings.cache_clear()
+    import app.db_models  # noqa: F401 - registers the app-owned tables on Base
+    from models import Base
+    from app.services.blob_store import BlobStore
+
+    engine = create_engine(f"sqlite:///{tmp_path}/blobs.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    yield BlobStore(str(tmp_path / "blobs")), db
+    db.close()
+    engine.dispose()
+    get_settings.cache_clear()
+
+
+def upload(store, db, resume_id: str, commit: bool = True):
+    staged = store.staging_path(resume_id, "pdf")
+    with open(staged, "wb") as f:
+        f.write(CONTENT)
+    path = store.put(staged, SHA256, "pdf")
+    store.attach(db, resume_id, SHA256, "pdf", len(CONTENT), path)
+    if commit:
+        db.commit()
+        store.settle(staged, path)
+    return staged, path
+
+
+def test_reused_blob_released_before_the_new_reference_commits_is_restored(store_and_db):
+    store, db = store_and_db
+    _, path = upload(store, db, "first")
+
+    # Second upload of the same file reuses the blob, then the first resume is
+    # deleted before the second upload has committed its reference
+    staged, reused = upload(store, db, "second", commit=False)
+    assert reused == path and os.path.exists(staged)
+    other = sessionmaker(bind=db.get_bind())()
+    assert store.release(other, "first")
+    other.close()
+    assert not os.path.exists(path)
+
+    db.commit()
+    store.settle(staged, path)
+    assert not os.path.exists(staged)
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+
+
+def test_release_keeps_blob_referenced_by_a_committed_upload(store_and_db):
+    store, db = store_and_db
+    upload(store, db, "first")
+    staged, path = upload(store, db, "second")
+
+    assert not os.path.exists(staged)
+    assert not store.release(db, "first")
+    assert os.path.exists(path)
+    assert store.release(db, "second")
+    assert not os.path.exists(path)
+    assert [name for name in os.listdir(os.path.dirname(path))] == []
+
+
+def test_purge_only_removes_unreferenced_blobs(store_and_db):
+    store, db = store_and_db
+    _, path = upload(store, db, "kept")
+    gone_path = store.path_for("f" * 64, "pdf")
+    os.makedirs(os.path.dirname(gone_path), exist_ok=True)
+    open(gone_path, "wb").close()
+
+    assert store.purge(db, {SHA256: path, "f" * 64: gone_path}) == 1
+    assert os.path.exists(path)
+    assert not os.path.exists(gone_path)
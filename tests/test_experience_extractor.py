@@ -0,0 +1,31 @@
+import pytest
+
+from app.services.experience_extractor import extract_date_ranges, extract_required_years
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Marketing 2019 - 2020", (("2019-01", "2020-12"),)),
+    ("Junior developer 2018 - 2020", (("2018-01", "2020-12"),)),
+    ("Decision support, 2015 to 2016", (("2015-01", "2016-12"),)),
+    ("Jan 2019 - Present", (("2019-01", "present"),)),
+    ("Sept. 2017 - March 2019", (("2017-09", "2019-03"),)),
+    ("September 2017 – Dec 2018", (("2017-09", "2018-12"),)),
+    ("05/2016 - 07/2018", (("2016-05", "2018-07"),)),
+])
+def test_date_ranges_only_read_real_month_names(text, expected):
+    assert extract_date_ranges(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("5+ years of experience in Python", 5),
+    ("Experience: 4 years", 4),
+    ("At least 4 years' experience with Java", 4),
+    ("At least 6 years’ experience in backend development", 6),
+    ("Requires 123 years of experience", 0),
+    ("3+ years working with Python", 3),
+    ("2 years of professional programming in Go", 2),
+    ("We have 10 years in business", 0),
+    ("Join a team that has grown for 7 years with our clients", 0),
+])
+def test_required_years_need_experience_wording(text, expected):
+    assert extract_required_years(text) == expected
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.config import get_settings
+
+
+@pytest.fixture
+def writer_and_session(tmp_path, monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    get_settings.cache_clear()
+    import app.db_models  # noqa: F401 - registers the app-owned tables on Base
+    from models import Base
+    from app.services.history_writer import HistoryWriter
+
+    engine = create_engine(f"sqlite:///{tmp_path}/history.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    yield HistoryWriter(Session), Session, engine
+    engine.dispose()
+    get_settings.cache_clear()
+
+
+def test_rows_stay_pending_until_their_batch_commits(writer_and_session):
+    from models import ChatHistory
+    writer, Session, engine = writer_and_session
+
+    committing = threading.Event()
+    release = threading.Event()
+
+    @event.listens_for(engine, "commit")
+    def hold_commit(_):
+        committing.set()
+        assert release.wait(5)
+
+    writer.add_chat(ChatHistory(user_id="u1", resume_id="r1", user_query="q", ai_response="a"))
+    background = threading.Thread(target=writer.flush)
+    background.start()
+    assert committing.wait(5)
+
+    # The batch has left the buffer but is not committed yet
+    assert writer.pending() == 0
+    assert writer.pending("u1") == 1
+
+    # A reader flushing before it queries waits for the in-flight batch
+    reader = threading.Thread(target=writer.flush)
+    reader.start()
+    reader.join(0.2)
+    assert reader.is_alive()
+
+    release.set()
+    background.join(5)
+    reader.join(5)
+    assert writer.pending("u1") == 0
+    db = Session()
+    try:
+        assert db.query(ChatHistory).filter(ChatHistory.user_id == "u1").count() == 1
+    finally:
+        db.close()
@@ -0,0 +1,75 @@
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+JOB_DESCRIPTION = (
+    "Senior Machine Learning Engineer. 5+ years of experience with Python, PyTorch "
+    "and Docker. Kubernetes and AWS are a plus."
+)
+
+
+def register_and_upload(test_client) -> tuple:
+    from docx import Document
+
+    response = test_client.post("/register", json={
+        "email": "coalesce@example.com", "username": "coalesce", "password": "secret1"
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    document = Document()
+    document.add_paragraph("Jane Doe jane@example.com")
+    document.add_paragraph("EXPERIENCE Acme Corp Jan 2019 - Present. Built ML models with PyTorch and Python.")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    response = test_client.post(
+        "/upload-resume",
+        files={"file": ("cv.docx", buffer.getvalue(), "application/octet-stream")},
+        headers=headers
+    )
+    resume_id = response.json()["resume_id"]
+
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        status = test_client.get(f"/resume/{resume_id}/status", headers=headers).json()
+        if status.get("status") != "processing":
+            break
+        time.sleep(0.1)
+    assert status.get("status") == "done", status
+    return headers, resume_id
+
+
+def test_identical_concurrent_matches_share_one_llm_call(app_client, monkeypatch):
+    main, test_client = app_client
+    headers, resume_id = register_and_upload(test_client)
+    gateway = main.rag_service.llm
+
+    upstream_calls = 0
+    calls_lock = threading.Lock()
+
+    def slow_upstream(messages, max_tokens, temperature):
+        nonlocal upstream_calls
+        with calls_lock:
+            upstream_calls += 1
+        time.sleep(0.5)
+        return "Learn Kubernetes."
+
+    monkeypatch.setattr(gateway, "_complete_uncoalesced", slow_upstream)
+    coalesced_before = gateway.coalesced
+
+    def match(_):
+        return test_client.post(
+            "/job-match",
+            json={"resume_id": resume_id, "job_description": JOB_DESCRIPTION},
+            headers=headers
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(match, range(4)))
+
+    assert [response.status_code for response in responses] == [200] * 4
+    assert all(response.json()["recommendations"] == "Learn Kubernetes." for response in responses)
+    # The event loop stays free while the first call waits, so the rest join it
+    assert upstream_calls == 1
+    assert gateway.coalesced - coalesced_before == 3
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import get_settings
+from app.services.llm_gateway import LLMGateway, LLMUnavailableError
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "stub",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    }
+
+
+class StubGroq:
+    """Local HTTP server answering chat completions from a scripted list of (status, headers, body)"""
+
+    def __init__(self, responses, delay: float = 0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("content-length", 0)))
+                stub.calls += 1
+                time.sleep(stub.delay)
+                status, headers, body = stub.responses.pop(0) if len(stub.responses) > 1 else stub.responses[0]
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/openai/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def gateway_for(monkeypatch):
+    gateways = []
+
+    def make(stub: StubGroq, **env) -> LLMGateway:
+        monkeypatch.setenv("GROQ_API_KEY", "test-key")
+        monkeypatch.setenv("GROQ_BASE_URL", stub.url)
+        monkeypatch.setenv("LLM_BACKOFF_BASE_SECONDS", "0.01")
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        get_settings.cache_clear()
+        gateway = LLMGateway()
+        gateways.append(gateway)
+        return gateway
+
+    yield make
+    for gateway in gateways:
+        gateway.close()
+    get_settings.cache_clear()
+
+
+def test_retries_429_honouring_retry_after(gateway_for):
+    rate_limited = (429, {"retry-after": "0.2"}, {"error": {"message": "rate limited", "type": "rate_limit"}})
+    with StubGroq([rate_limited, (200, {}, completion("ok"))]) as stub:
+        gateway = gateway_for(stub)
+        started = time.monotonic()
+        assert gateway.complete(MESSAGES, max_tokens=10, temperature=0.0) == "ok"
+        assert time.monotonic() - started >= 0.2
+        assert stub.calls == 2
+        assert gateway.stats()["circuit"] == "closed"
+
+
+def test_failed_call_counts_once_towards_circuit(gateway_for):
+    server_error = (500, {}, {"error": {"message": "boom", "type": "server_error"}})
+    with StubGroq([server_error]) as stub:
+        gateway = gateway_for(stub, LLM_MAX_RETRIES=3, LLM_CIRCUIT_FAILURE_THRESHOLD=2)
+
+        with pytest.raises(LLMUnavailableError):
+            gateway.complete(MESSAGES, max_tokens=10, temperature=0.0)
+        assert stub.calls == 4
+        assert gateway.stats()["consecutive_failures"] == 1
+        assert gateway.stats()["circuit"] == "closed"
+
+        with pytest.raises(LLMUnavailableError):
+            gateway.complete(MESSAGES, max_tokens=10, temperature=0.0)
+        assert gateway.stats()["circuit"] == "open"
+
+        # Open circuit: fails fast without calling the provider
+        with pytest.raises(LLMUnavailableError):
+            gateway.complete(MESSAGES, max_tokens=10, temperature=0.0)
+        assert stub.calls == 8
@@ -0,0 +1,45 @@
+def register(test_client, name: str):
+    response = test_client.post("/register", json={
+        "email": f"{name}@example.com", "username": name, "password": "secret1"
+    })
+    assert response.status_code == 200, response.text
+
+
+def login(test_client, name: str, password: str = "secret1"):
+    return test_client.post("/login", data={"username": f"{name}@example.com", "password": password})
+
+
+def test_login_goes_through_authenticate_user(app_client, monkeypatch):
+    main, test_client = app_client
+    register(test_client, "login-ok")
+
+    calls = []
+    original = main.authenticate_user
+
+    def recording(db, email, password):
+        calls.append(email)
+        return original(db, email, password)
+
+    monkeypatch.setattr(main, "authenticate_user", recording)
+    response = login(test_client, "login-ok")
+    assert response.status_code == 200
+    assert calls == ["login-ok@example.com"]
+    assert response.json()["username"] == "login-ok"
+
+    db = main.SessionLocal()
+    try:
+        user = db.query(main.User).filter(main.User.email == "login-ok@example.com").one()
+        assert user.last_login is not None
+    finally:
+        db.close()
+
+    assert login(test_client, "login-ok", password="wrong").status_code == 401
+
+
+def test_login_respects_authenticate_user_refusals(app_client, monkeypatch):
+    main, test_client = app_client
+    register(test_client, "login-locked")
+
+    # e.g. a lockout or inactive-user check inside auth.authenticate_user
+    monkeypatch.setattr(main, "authenticate_user", lambda db, email, password: None)
+    assert login(test_client, "login-locked").status_code == 401
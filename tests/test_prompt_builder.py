@@ -0,0 +1,24 @@
+from app.services.prompt_builder import PromptBuilder
+
+
+def word_count(text: str) -> int:
+    return len(text.split())
+
+
+def test_pack_drops_segments_with_the_same_words_in_another_order():
+    builder = PromptBuilder(word_count)
+    segments = [
+        "Built Python services on AWS with Docker.",
+        "Docker, AWS and Python services built.",
+        "Led a team of four engineers.",
+    ]
+    text, _ = builder.pack(segments, budget=100, relevance_terms={"python"})
+    assert text == "Built Python services on AWS with Docker. Led a team of four engineers."
+
+
+def test_seen_keys_carry_across_pack_calls():
+    builder = PromptBuilder(word_count)
+    seen = set()
+    builder.pack(["Python, Docker and AWS."], budget=100, relevance_terms=set(), seen=seen)
+    text, used = builder.pack(["AWS and Docker and Python."], budget=100, relevance_terms=set(), seen=seen)
+    assert (text, used) == ("", 0)
@@ -0,0 +1,31 @@
+from app.services.resume_parser import ResumeParser
+
+
+def test_title_case_words_inside_sentences_do_not_start_sections():
+    text = ResumeParser._clean_text(
+        "Jane Doe\n"
+        "I have 3 years of Experience building APIs. Strong Communication Skills.\n"
+        "Led Projects on payments.\n"
+        "\n"
+        "Work Experience:\n"
+        "Acme Corp, Jan 2019 - Present\n"
+        "Technical Skills: Python, Go\n"
+    )
+    assert ResumeParser.split_sections(text) == [
+        {"section": "summary", "text": "Jane Doe\nI have 3 years of Experience building APIs. "
+                                       "Strong Communication Skills.\nLed Projects on payments."},
+        {"section": "experience", "text": "Acme Corp, Jan 2019 - Present"},
+        {"section": "skills", "text": "Python, Go"},
+    ]
+
+
+def test_upper_case_headings_split_single_line_text():
+    assert ResumeParser.split_sections("Jane Doe EXPERIENCE Acme Corp 2019 - 2021. SKILLS Python") == [
+        {"section": "summary", "text": "Jane Doe"},
+        {"section": "experience", "text": "Acme Corp 2019 - 2021."},
+        {"section": "skills", "text": "Python"},
+    ]
+
+
+def test_clean_text_keeps_single_line_breaks():
+    assert ResumeParser._clean_text("  Jane \t Doe \n\n \n Summary  \n") == "Jane Doe\nSummary"
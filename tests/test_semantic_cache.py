@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from app.config import get_settings
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("VECTOR_DIMENSION", "4")
+    get_settings.cache_clear()
+    from app.services.semantic_cache import SemanticCache
+    yield SemanticCache(embedding_service=None)
+    get_settings.cache_clear()
+
+
+def unit(*values):
+    vector = np.array(values, dtype="float32")
+    return vector / np.linalg.norm(vector)
+
+
+def test_hit_returns_the_context_stored_with_the_answer(cache):
+    fingerprint = cache.fingerprint("resume text")
+    context = ["Built ML models with PyTorch.", "Led a team of four."]
+    cache.store("r1", fingerprint, "How do I grow?", unit(1, 0, 0, 0), "Mentor others.", context)
+
+    assert cache.lookup("r1", fingerprint, unit(1, 0.01, 0, 0)) == ("Mentor others.", context)
+    assert cache.lookup("r1", fingerprint, unit(0, 1, 0, 0)) is None
+
+
+def test_least_recently_used_resumes_are_evicted(cache):
+    cache.max_resumes = 2
+    fingerprint = cache.fingerprint("resume text")
+    for resume_id in ("r1", "r2"):
+        cache.store(resume_id, fingerprint, "q", unit(1, 0, 0, 0), f"answer {resume_id}", [])
+
+    # r1 is used again, so r2 is the one dropped when r3 arrives
+    assert cache.lookup("r1", fingerprint, unit(1, 0, 0, 0)) == ("answer r1", [])
+    cache.store("r3", fingerprint, "q", unit(1, 0, 0, 0), "answer r3", [])
+
+    assert cache.stats()["resumes"] == 2
+    assert cache.lookup("r2", fingerprint, unit(1, 0, 0, 0)) is None
+    assert cache.lookup("r1", fingerprint, unit(1, 0, 0, 0)) == ("answer r1", [])
+    assert cache.lookup("r3", fingerprint, unit(1, 0, 0, 0)) == ("answer r3", [])
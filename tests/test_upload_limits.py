@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-5", "1e6"])
+def test_malformed_content_length_is_rejected_with_400(app_client, content_length):
+    _, test_client = app_client
+    response = test_client.post(
+        "/upload-resume",
+        content=b"x",
+        headers={"content-length": content_length, "content-type": "application/octet-stream"}
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid Content-Length header"}
+
+
+def test_oversized_content_length_is_rejected_with_413(app_client):
+    main, test_client = app_client
+    response = test_client.post(
+        "/upload-resume",
+        content=b"x",
+        headers={"content-length": str(main.settings.max_upload_bytes * 2),
+                 "content-type": "application/octet-stream"}
+    )
+    assert response.status_code == 413
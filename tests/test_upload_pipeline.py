@@ -0,0 +1,150 @@
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.config import get_settings
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def crash_first_attempt(resume_id, file_path, data=None):
+    """Parse job whose worker process dies the first time it sees a file"""
+    from app.services.upload_pipeline import parse_resume_job
+    marker = f"{file_path}.crashed"
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return parse_resume_job(resume_id, file_path, data)
+
+
+def slow_parse(resume_id, file_path, data=None):
+    from app.services.upload_pipeline import parse_resume_job
+    time.sleep(1.0)
+    return parse_resume_job(resume_id, file_path, data)
+
+
+class StubEmbeddings:
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.vector_store = None
+        self.batches_under_lock = 0
+
+    def generate_embedding(self, text):
+        return np.ones(self.dimension, dtype=np.float32).tolist()
+
+    def generate_embeddings_batch(self, texts):
+        # Another thread must be able to take the store lock while we embed
+        acquired = []
+
+        def probe():
+            acquired.append(self.vector_store.lock.acquire(timeout=1))
+            if acquired[0]:
+                self.vector_store.lock.release()
+
+        prober = threading.Thread(target=probe)
+        prober.start()
+        prober.join()
+        if not acquired[0]:
+            self.batches_under_lock += 1
+        return np.ones((len(texts), self.dimension), dtype=np.float32)
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(ROOT, "data"), tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setenv("JOB_QUEUE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setenv("VECTOR_STORE_PATH", str(tmp_path / "vectors"))
+    monkeypatch.setenv("JOB_POLL_INTERVAL", "0.05")
+    monkeypatch.setenv("PARSE_WORKERS", "1")
+    get_settings.cache_clear()
+
+    from app.services.job_queue import JobQueue
+    from app.services.upload_pipeline import UploadPipeline
+    from app.services.vector_store import VectorStore
+    from app.services.rag_service import RAGService
+
+    ready = []
+    vector_store = VectorStore()
+    embeddings = StubEmbeddings(vector_store.dimension)
+    embeddings.vector_store = vector_store
+    # Real section indexing, minus the models RAGService would load
+    rag = RAGService.__new__(RAGService)
+    rag.vector_store, rag.embedding_service = vector_store, embeddings
+    pipeline = UploadPipeline(
+        queue=JobQueue(),
+        embedding_service=embeddings,
+        vector_store=vector_store,
+        index_sections=rag.index_resume_sections,
+        on_ready=lambda job, parsed: ready.append(job["resume_id"])
+    )
+    pipeline.ready = ready
+    yield pipeline
+    pipeline.stop()
+    get_settings.cache_clear()
+
+
+def enqueue_resume(pipeline, resume_id: str) -> str:
+    from docx import Document
+    os.makedirs(pipeline.settings.upload_dir, exist_ok=True)
+    path = os.path.join(pipeline.settings.upload_dir, f"{resume_id}.docx")
+    document = Document()
+    document.add_paragraph("Jane Doe. EXPERIENCE Acme Corp Jan 2019 - Present. Python and Docker.")
+    document.save(path)
+    pipeline.queue.enqueue(resume_id, "user-1", "cv.docx", path)
+    return path
+
+
+def wait_for(condition, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_dead_parse_worker_is_replaced_and_job_retried(pipeline, monkeypatch):
+    import app.services.upload_pipeline as upload_pipeline
+    monkeypatch.setattr(upload_pipeline, "parse_resume_job", crash_first_attempt)
+    enqueue_resume(pipeline, "crashy")
+    pipeline.start()
+    first_pool = pipeline.parse_pool
+
+    assert wait_for(lambda: pipeline.queue.get("crashy")["status"] in ("done", "failed"))
+    job = pipeline.queue.get("crashy")
+    assert job["status"] == "done", job["error"]
+    assert pipeline.parse_pool is not first_pool
+    assert pipeline.ready == ["crashy"]
+    assert pipeline.vector_store.has_documents("crashy", "resume_section")
+    assert pipeline.embedding_service.batches_under_lock == 0
+
+    # The replacement pool keeps serving later uploads
+    monkeypatch.setattr(upload_pipeline, "parse_resume_job", slow_parse)
+    enqueue_resume(pipeline, "after")
+    assert wait_for(lambda: pipeline.queue.get("after")["status"] == "done")
+
+
+def test_upload_deleted_while_parsing_leaves_nothing_behind(pipeline, monkeypatch):
+    import app.services.upload_pipeline as upload_pipeline
+    from app.services.parsed_resume import ParsedResume
+    monkeypatch.setattr(upload_pipeline, "parse_resume_job", slow_parse)
+    enqueue_resume(pipeline, "deleted")
+    pipeline.start()
+
+    assert wait_for(lambda: pipeline.queue.get("deleted")["status"] == "running")
+    # What DELETE /resume/{id} does for the pipeline
+    pipeline.queue.delete("deleted")
+    pipeline.cancel(["deleted"])
+
+    time.sleep(3)
+    assert not os.path.exists(ParsedResume.path_for("deleted"))
+    assert pipeline.vector_store.index.ntotal == 0
+    assert pipeline.ready == []
@@ -0,0 +1,72 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from app.config import get_settings
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("VECTOR_STORE_PATH", str(tmp_path / "vectors"))
+    get_settings.cache_clear()
+    from app.services.vector_store import VectorStore
+    yield VectorStore()
+    get_settings.cache_clear()
+
+
+def add_resume(store, resume_id: str, count: int = 3):
+    rng = np.random.default_rng(abs(hash(resume_id)) % 2**32)
+    store.add_documents(
+        embeddings=rng.random((count, store.dimension), dtype=np.float32),
+        documents=[f"{resume_id} chunk {i}" for i in range(count)],
+        metadata=[{"resume_id": resume_id, "type": "resume_section"} for _ in range(count)]
+    )
+
+
+def test_concurrent_writers_readers_and_saves_stay_consistent(store):
+    errors = []
+
+    def guarded(work):
+        def run():
+            try:
+                work()
+            except Exception as e:  # surfaced through the assertion below
+                errors.append(e)
+        return threading.Thread(target=run)
+
+    def writer(prefix):
+        for i in range(40):
+            add_resume(store, f"{prefix}-{i}")
+            if i % 2:
+                store.remove_resumes([f"{prefix}-{i - 1}"])
+
+    def reader():
+        query = np.ones(store.dimension, dtype=np.float32)
+        for _ in range(80):
+            for text, meta, _ in store.search(query, k=5):
+                assert meta["type"] != "deleted" and text
+
+    def saver():
+        for _ in range(20):
+            store.save()
+
+    threads = [guarded(lambda p=p: writer(p)) for p in ("a", "b")]
+    threads += [guarded(reader), guarded(saver)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+    store.save()
+    assert not any(name.endswith(".tmp") for name in os.listdir(store.settings.vector_store_path))
+
+    from app.services.vector_store import VectorStore
+    reloaded = VectorStore()
+    assert reloaded.load()
+    assert reloaded.index.ntotal == len(reloaded.documents) == len(reloaded.metadata) == 2 * 40 * 3
+    live = {meta["resume_id"] for meta in reloaded.metadata if meta["type"] != "deleted"}
+    assert live == {f"{prefix}-{i}" for prefix in ("a", "b") for i in range(1, 40, 2)}